@@ -0,0 +1,33 @@
+"""Hàm dùng chung cho các script đo hiệu năng trong thư mục này"""
+import os
+import statistics
+import sys
+import time
+
+# Các module nằm phẳng ở thư mục gốc của repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def timed(func):
+    """(kết quả, thời gian chạy một lần tính bằng giây)"""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def measure(func, repeat):
+    """Trung vị thời gian (giây) của repeat lần gọi func()"""
+    return statistics.median(timed(func)[1] for _ in range(repeat))
+
+def format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+def print_table(title, columns, rows, width=14):
+    """rows: list (nhãn, list giá trị đã định dạng theo columns)"""
+    label_width = max([24] + [len(label) + 2 for label, _ in rows])
+    print(title)
+    print(' ' * label_width + ''.join(f"{c:>{width}}" for c in columns))
+    for label, values in rows:
+        print(f"{label:{label_width}}" + ''.join(f"{v:>{width}}" for v in values))
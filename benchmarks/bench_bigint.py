@@ -0,0 +1,61 @@
+"""
+So sánh thời gian các phép RSA theo engine (Python/OpenSSL) và backend số nguyên lớn (bigint).
+Chạy từ thư mục gốc: python benchmarks/bench_bigint.py [--bits 2048] [--repeat 5] [--seed 1]
+"""
+import argparse
+
+from _bench import format_time, measure, print_table
+
+import bigint
+import entropy
+import rsa
+
+def configurations():
+    """Các cặp (engine, backend): engine Python với mọi backend, OpenSSL với backend mặc định"""
+    configs = [('python', name) for name in bigint.available_backends()]
+    return configs + [('openssl', bigint.set_backend('auto'))]
+
+def bench(engine, backend, bits, repeat, seed):
+    bigint.set_backend(backend)
+    rsa.set_engine(engine)
+    # Cùng seed cho mọi cấu hình để các phép đo lặp lại được (KHÔNG dùng cho khóa thật);
+    # OpenSSL dùng nguồn ngẫu nhiên riêng nên khóa của nó khác
+    entropy.seed(seed)
+    private_key, public_key = rsa.generate_key_pair(bits, workers=1)
+    message = b'x' * 32
+    ciphertext = rsa.encrypt_bytes(message, public_key)
+    envelope = rsa.encrypt_envelope_bytes(b'x' * 1024, public_key)
+    results = {
+        'generate_key_pair': measure(lambda: rsa.generate_key_pair(bits, workers=1), repeat),
+        'encrypt': measure(lambda: rsa.encrypt_bytes(message, public_key), repeat * 20),
+        # decrypt_bytes luôn chạy bằng Python/bigint (implicit rejection của OpenSSL)
+        'decrypt (CRT)': measure(lambda: rsa.decrypt_bytes(ciphertext, private_key), repeat * 20),
+        'decrypt envelope 1 KB': measure(lambda: rsa.decrypt_envelope_bytes(envelope, private_key), repeat * 20),
+    }
+    if engine == 'python':
+        results['generate_large_prime'] = measure(lambda: rsa.generate_large_prime(bits // 2), repeat * 4)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bits', type=int, default=2048, choices=[512, 1024, 2048])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    previous = bigint.get_backend(), rsa.get_engine()
+    configs = configurations()
+    try:
+        results = [bench(engine, backend, args.bits, args.repeat, args.seed) for engine, backend in configs]
+    finally:
+        bigint.set_backend(previous[0])
+        rsa.set_engine(previous[1])
+        entropy.seed(None)
+
+    columns = [f"{engine}/{backend}" if engine == 'python' else engine for engine, backend in configs]
+    ops = ['generate_key_pair', 'generate_large_prime', 'encrypt', 'decrypt (CRT)', 'decrypt envelope 1 KB']
+    rows = [(op, [format_time(r[op]) if op in r else '-' for r in results]) for op in ops]
+    print_table(f"RSA {args.bits} bit, trung vị của các lần chạy (1 tiến trình), engine/backend", columns, rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+So sánh phép toán private key qua CRT (rsa.private_op với p, q) với pow(c, d, n) đầy đủ
+ở 1024 và 2048 bit, cho từng backend số nguyên lớn đang có.
+Chạy từ thư mục gốc: python benchmarks/bench_crt.py [--bits 1024 2048] [--repeat 50]
+"""
+import argparse
+
+from _bench import format_time, measure, print_table
+
+import bigint
+import entropy
+import rsa
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bits', type=int, nargs='+', default=[1024, 2048], choices=[512, 1024, 2048])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    previous = bigint.get_backend()
+    rows = []
+    try:
+        for bits in args.bits:
+            for name in bigint.available_backends():
+                bigint.set_backend(name)
+                # Seed cố định: các backend đo trên cùng khóa và bản mã (KHÔNG dùng cho khóa thật)
+                entropy.seed(args.seed)
+                private_key, public_key = rsa.generate_key_pair(bits, workers=1)
+                c = entropy.randbelow(public_key.n)
+                if rsa.private_op(c, private_key) != pow(c, private_key.d, private_key.n):
+                    raise SystemExit("CRT cho kết quả khác pow(c, d, n)")
+                full = measure(lambda: bigint.powmod(c, private_key.d, private_key.n), args.repeat)
+                crt = measure(lambda: rsa.private_op(c, private_key), args.repeat)
+                rows.append((f"{bits} bit, {name}", [format_time(full), format_time(crt), f"{full / crt:.1f}x"]))
+    finally:
+        bigint.set_backend(previous)
+        entropy.seed(None)
+
+    print_table("Phép toán private key (trung vị), 1 tiến trình", ['pow(c, d, n)', 'CRT', 'tăng tốc'], rows)
+
+if __name__ == '__main__':
+    main()
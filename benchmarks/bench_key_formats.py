@@ -0,0 +1,55 @@
+"""
+Thời gian nạp khóa theo kích thước cho từng định dạng: PEM văn bản (n|d thập phân trong base64),
+nhị phân gọn (RSAK) và PKCS#1 DER (nạp từ bytes và từ memoryview).
+Chạy từ thư mục gốc: python benchmarks/bench_key_formats.py [--bits 512 1024 2048] [--repeat 2000]
+"""
+import argparse
+
+from _bench import format_time, measure, print_table
+
+import entropy
+import rsa
+
+def formats(private_key, public_key):
+    """(nhãn, hàm nạp, dữ liệu) cho mọi định dạng của một cặp khóa"""
+    items = []
+    for kind, key, load, text, binary in (
+            ('public', public_key, rsa.load_public_key, rsa.serialize_public_key, rsa.serialize_public_key_binary),
+            ('private', private_key, rsa.load_private_key, rsa.serialize_private_key, rsa.serialize_private_key_binary)):
+        compact, der = binary(key), binary(key, der=True)
+        items += [
+            (f"{kind} PEM", load, text(key)),
+            (f"{kind} gọn", load, compact),
+            (f"{kind} gọn (memoryview)", load, memoryview(compact)),
+            (f"{kind} DER", load, der),
+        ]
+    return items
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bits', type=int, nargs='+', default=[512, 1024, 2048], choices=[512, 1024, 2048])
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    entropy.seed(args.seed)
+    try:
+        keys = {bits: rsa.generate_key_pair(bits, workers=1) for bits in args.bits}
+    finally:
+        entropy.seed(None)
+
+    rows = {}
+    for bits in args.bits:
+        private_key, public_key = keys[bits]
+        for label, load, data in formats(private_key, public_key):
+            if load(data).n != public_key.n:
+                raise SystemExit(f"Nạp sai khóa: {label}")
+            # Trung vị theo lô 100 lần gọi để bớt nhiễu của phép đo rất ngắn
+            elapsed = measure(lambda: [load(data) for _ in range(100)], max(args.repeat // 100, 1)) / 100
+            rows.setdefault(label, []).append(format_time(elapsed))
+
+    print_table("Thời gian nạp một khóa (trung vị), 1 tiến trình", [f"{bits} bit" for bits in args.bits],
+                list(rows.items()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Phân bố thời gian generate_key_pair(2048): tìm số nguyên tố bằng cửa sổ sàng (hiện tại)
+so với cách cũ (mỗi ứng viên là một số ngẫu nhiên mới, Miller-Rabin 5 vòng cho mọi ứng viên).
+Mặc định dùng backend 'python' vì backend gmpy2 bỏ qua cửa sổ sàng (dùng next_prime của GMP).
+Chạy từ thư mục gốc: python benchmarks/bench_keygen.py [--runs 20] [--legacy-runs 5]
+"""
+import argparse
+import random
+import statistics
+
+from _bench import format_time, print_table, timed
+
+import bigint
+import entropy
+import rsa
+
+def legacy_is_prime(n, rng, k=5):
+    """is_prime của bản gốc: Miller-Rabin k cơ sở ngẫu nhiên, không chia thử"""
+    if n <= 3:
+        return n > 1
+    if n % 2 == 0:
+        return False
+    r, d = 0, n - 1
+    while d % 2 == 0:
+        r += 1
+        d //= 2
+    for _ in range(k):
+        x = pow(rng.randint(2, n - 2), d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def legacy_key_pair(key_size, rng):
+    """Phần tìm p, q của generate_key_pair bản gốc (kể cả bỏ cặp khi n thiếu bit)"""
+    def prime(bits):
+        while True:
+            n = rng.getrandbits(bits) | (1 << bits - 1) | 1
+            if legacy_is_prime(n, rng):
+                return n
+    while True:
+        p, q = prime(key_size // 2), prime(key_size - key_size // 2)
+        if p != q and (p * q).bit_length() == key_size:
+            return p, q
+
+def distribution(times):
+    ordered = sorted(times)
+    return [str(len(times)), format_time(statistics.mean(times)), format_time(statistics.median(times)),
+            format_time(ordered[0]), format_time(ordered[int(0.9 * (len(ordered) - 1))]), format_time(ordered[-1])]
+
+def histogram(times, bins=8, width=40):
+    low, high = min(times), max(times)
+    step = (high - low) / bins or 1
+    counts = [0] * bins
+    for t in times:
+        counts[min(int((t - low) / step), bins - 1)] += 1
+    for i, count in enumerate(counts):
+        print(f"  {format_time(low + i * step):>10} .. {format_time(low + (i + 1) * step):>10}  "
+              + '#' * round(width * count / max(counts)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bits', type=int, default=2048, choices=[512, 1024, 2048])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--legacy-runs', type=int, default=5, help="0 để bỏ qua cách cũ (rất chậm)")
+    parser.add_argument('--backend', default='python', choices=['auto', 'python', 'gmpy2'])
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    previous = bigint.get_backend()
+    bigint.set_backend(args.backend)
+    entropy.seed(args.seed)
+    try:
+        current = [timed(lambda: rsa.generate_key_pair(args.bits, workers=1))[1] for _ in range(args.runs)]
+    finally:
+        bigint.set_backend(previous)
+        entropy.seed(None)
+    rng = random.Random(args.seed)
+    legacy = [timed(lambda: legacy_key_pair(args.bits, rng))[1] for _ in range(args.legacy_runs)]
+
+    rows = [('cửa sổ sàng', distribution(current))]
+    if legacy:
+        rows.insert(0, ('cách cũ', distribution(legacy)))
+    print_table(f"generate_key_pair({args.bits}), backend {args.backend}, 1 tiến trình",
+                ['số lần', 'trung bình', 'trung vị', 'min', 'p90', 'max'], rows, width=12)
+    print("\nPhân bố (cửa sổ sàng):")
+    histogram(current)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+So sánh khóa RSA nhiều số nguyên tố (RFC 8017): phép toán private key qua CRT 3, 4 số
+với CRT 2 số và pow(c, d, n) đầy đủ, kèm thời gian sinh khóa, cho từng backend bigint.
+Chạy từ thư mục gốc: python benchmarks/bench_multiprime.py [--bits 2048] [--repeat 30]
+"""
+import argparse
+
+from _bench import format_time, measure, print_table, timed
+
+import bigint
+import entropy
+import rsa
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bits', type=int, default=2048, choices=[1024, 2048])
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--keygen-runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    previous = bigint.get_backend()
+    names = bigint.available_backends()
+    rows = {}
+    try:
+        for name in names:
+            bigint.set_backend(name)
+            entropy.seed(args.seed)
+            for primes in range(2, rsa.MAX_PRIMES[args.bits] + 1):
+                keygen = sorted(timed(lambda: rsa.generate_key_pair(args.bits, workers=1, primes=primes))[1]
+                                for _ in range(args.keygen_runs))[args.keygen_runs // 2]
+                private_key, public_key = rsa.generate_key_pair(args.bits, workers=1, primes=primes)
+                c = entropy.randbelow(public_key.n)
+                if rsa.private_op(c, private_key) != pow(c, private_key.d, private_key.n):
+                    raise SystemExit(f"CRT {primes} số cho kết quả khác pow(c, d, n)")
+                if primes == 2:
+                    full = measure(lambda: bigint.powmod(c, private_key.d, private_key.n), args.repeat)
+                    rows.setdefault('pow(c, d, n)', []).append(format_time(full))
+                crt = measure(lambda: rsa.private_op(c, private_key), args.repeat)
+                rows.setdefault(f"CRT {primes} số", []).append(format_time(crt))
+                rows.setdefault(f"sinh khóa {primes} số", []).append(format_time(keygen))
+    finally:
+        bigint.set_backend(previous)
+        entropy.seed(None)
+
+    order = sorted(rows, key=lambda label: (label.startswith('sinh khóa'), label.startswith('CRT'), label))
+    print_table(f"RSA {args.bits} bit: private op và sinh khóa (trung vị), 1 tiến trình",
+                names, [(label, rows[label]) for label in order])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+So sánh mã hóa Playfair theo từng cặp (encrypt_pair, tìm vị trí tuyến tính trong ma trận)
+với bảng cặp dựng sẵn của PlayfairCipher (dict, và NumPy nếu đã cài) trên văn bản nhiều MB.
+Chạy từ thư mục gốc: python benchmarks/bench_playfair_tables.py [--mb 4] [--repeat 3]
+"""
+import argparse
+import random
+
+from _bench import format_time, measure, print_table, timed
+
+import playfair
+
+def per_pair(matrix, pairs, mode):
+    func = playfair.encrypt_pair if mode == 'encrypt' else playfair.decrypt_pair
+    return ''.join([func(matrix, pair[0], pair[1]) for pair in pairs])
+
+def table_dict(cipher, stream, mode):
+    # Tắt tạm đường NumPy để đo riêng bảng dict
+    saved = playfair.NUMPY_MIN_LENGTH
+    playfair.NUMPY_MIN_LENGTH = float('inf')
+    try:
+        return cipher.encrypt_stream(stream) if mode == 'encrypt' else cipher.decrypt_stream(stream)
+    finally:
+        playfair.NUMPY_MIN_LENGTH = saved
+
+def table_numpy(cipher, stream, mode):
+    return cipher.encrypt_stream(stream) if mode == 'encrypt' else cipher.decrypt_stream(stream)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mb', type=float, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    length = int(args.mb * (1 << 20))
+    rows = []
+    for size, matrix in (('5x5', playfair.generate_matrix_5x5('playfair example')),
+                         ('6x6', playfair.generate_matrix_6x6('playfair example 2024'))):
+        cipher = playfair.PlayfairCipher(matrix)
+        text = ''.join(rng.choices(cipher.alphabet + '  .,', k=length))
+        pairs = cipher.process_text(text)[0]
+        stream = pairs.stream
+        for mode in ('encrypt', 'decrypt'):
+            # Lần chạy chậm nhất chỉ một lần, đồng thời dùng để kiểm tra kết quả trùng nhau
+            expected, slow = timed(lambda: per_pair(matrix, pairs, mode))
+            if table_dict(cipher, stream, mode) != expected or table_numpy(cipher, stream, mode) != expected:
+                raise SystemExit(f"Kết quả khác nhau ({size} {mode})")
+            fast = measure(lambda: table_dict(cipher, stream, mode), args.repeat)
+            values = [format_time(slow), format_time(fast), f"{slow / fast:.0f}x"]
+            if playfair.np is not None:
+                vec = measure(lambda: table_numpy(cipher, stream, mode), args.repeat)
+                values += [format_time(vec), f"{slow / vec:.0f}x"]
+            rows.append((f"{size} {mode}", values))
+
+    columns = ['encrypt_pair', 'bảng dict', 'tăng tốc']
+    if playfair.np is not None:
+        columns += ['bảng NumPy', 'tăng tốc']
+    print_table(f"{args.mb:g} MB văn bản cho mỗi kích thước ma trận, 1 tiến trình", columns, rows)
+
+if __name__ == '__main__':
+    main()
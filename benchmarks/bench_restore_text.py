@@ -0,0 +1,81 @@
+"""
+Đo restore_text (bitmap, tuyến tính) so với vòng lặp cũ của giao diện (`idx in inserted_indices`
+trên list, O(n·k)) trên văn bản dày chữ đôi. Vòng lặp cũ là bậc hai nên chỉ chạy trên
+--legacy-kb KB đầu; restore_text chạy trên toàn bộ --mb MB.
+Chạy từ thư mục gốc: python benchmarks/bench_restore_text.py [--mb 50] [--legacy-kb 200]
+"""
+import argparse
+import random
+
+from _bench import format_time, print_table, timed
+
+import playfair
+
+WORDS = ['ball', 'Miss', 'toss', 'GOOD', 'feel', 'see', 'all', 'lass', 'bookkeeper', 'Hello', 'off',
+         'Mississippi', 'Jazz', 'SS', 'LL']
+
+def dense_text(size, rng):
+    """Văn bản nhiều chữ đôi (LL, SS, OO...), lẫn hoa/thường, dấu câu và xuống dòng"""
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS) + rng.choice(['  ', ' ', ', ', '. ', '\n'])
+        parts.append(word)
+        length += len(word)
+    return ''.join(parts)[:size]
+
+def legacy_restore(source, output_stream, inserted_indices, size='5'):
+    """Vòng lặp cũ trong playfair_run_cipher (trước restore_text)"""
+    inserted_indices = list(inserted_indices)
+    result = []
+    idx = 0
+    for char in source:
+        is_valid = playfair.is_ascii_letter(char) if size == '5' else playfair.is_ascii_alnum(char)
+        if is_valid:
+            if idx < len(output_stream):
+                c = output_stream[idx]
+                result.append(c.lower() if char.islower() else c)
+                idx += 1
+                while idx in inserted_indices and idx < len(output_stream):
+                    result.append(output_stream[idx])
+                    idx += 1
+        else:
+            result.append(char)
+    while idx < len(output_stream):
+        result.append(output_stream[idx])
+        idx += 1
+    return ''.join(result)
+
+def prepare(cipher, text):
+    pairs, inserted = playfair.process_plaintext_5x5(text)
+    return cipher.encrypt_pairs(pairs).stream, inserted
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mb', type=float, default=50)
+    parser.add_argument('--legacy-kb', type=float, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cipher = playfair.PlayfairCipher(playfair.generate_matrix_5x5('playfair example'))
+    text = dense_text(int(args.mb * (1 << 20)), rng)
+    rows = []
+
+    small = text[:int(args.legacy_kb * 1024)]
+    output, inserted = prepare(cipher, small)
+    old, old_time = timed(lambda: legacy_restore(small, output, inserted))
+    new, new_time = timed(lambda: playfair.restore_text(small, output, inserted))
+    if old != new:
+        raise SystemExit("restore_text khác vòng lặp cũ")
+    rows.append((f"{args.legacy_kb:g} KB", [str(len(inserted)), format_time(old_time), format_time(new_time)]))
+
+    output, inserted = prepare(cipher, text)
+    _, full_time = timed(lambda: playfair.restore_text(text, output, inserted))
+    rows.append((f"{args.mb:g} MB", [str(len(inserted)), '-', format_time(full_time)]))
+
+    print_table("restore_text trên văn bản dày chữ đôi (5x5), 1 tiến trình",
+                ['separator', 'vòng lặp cũ', 'restore_text'], rows)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+import math
+
+import entropy
+import primality
+
+try:
+    import gmpy2
+except ImportError:  # Không có gmpy2 thì chỉ dùng int của Python
+    gmpy2 = None
+
+# --- BACKEND SỐ NGUYÊN LỚN ---
+#
+# Các phép toán nặng của RSA (lũy thừa modulo, nghịch đảo, kiểm tra/tìm số nguyên tố)
+# đi qua backend đang chọn. 'gmpy2' dùng GMP (mpz) nếu đã cài, 'python' là int thuần.
+# Mọi hàm nhận và trả về int thường nên hai backend thay thế nhau được bất cứ lúc nào
+# (trừ native_int và gcd: trả về kiểu của backend, dùng khi cần giữ số ở dạng mpz).
+
+class PythonBackend:
+    name = 'python'
+    native = False
+
+    @staticmethod
+    def powmod(base, exp, mod):
+        return pow(base, exp, mod)
+
+    @staticmethod
+    def invert(a, m):
+        """a^-1 mod m; ValueError nếu không tồn tại"""
+        return pow(a, -1, m)
+
+    @staticmethod
+    def gcd(a, b):
+        return math.gcd(a, b)
+
+    @staticmethod
+    def native_int(x):
+        return int(x)
+
+    @staticmethod
+    def is_prime(n):
+        return primality.is_prime(n)
+
+    @staticmethod
+    def is_probable_prime(n, rounds=None, trial=True):
+        return primality.is_probable_prime(n, rounds, trial)
+
+    @staticmethod
+    def next_prime(n):
+        """Số nguyên tố nhỏ nhất lớn hơn n"""
+        if n < 2:
+            return 2
+        n = n + 1 | 1
+        while not primality.is_prime(n):
+            n += 2
+        return n
+
+class Gmpy2Backend:
+    name = 'gmpy2'
+    native = True
+
+    @staticmethod
+    def powmod(base, exp, mod):
+        return int(gmpy2.powmod(base, exp, mod))
+
+    @staticmethod
+    def invert(a, m):
+        try:
+            return int(gmpy2.invert(a, m))
+        except ZeroDivisionError:
+            raise ValueError("base is not invertible for the given modulus") from None
+
+    @staticmethod
+    def gcd(a, b):
+        return gmpy2.gcd(a, b)
+
+    @staticmethod
+    def native_int(x):
+        # mpz: nhân/chia số rất lớn bằng FFT của GMP (dùng cho cây tích trong keyaudit)
+        return gmpy2.mpz(x)
+
+    @staticmethod
+    def is_prime(n):
+        # GMP: chia thử + Baillie-PSW + các vòng Miller-Rabin ngẫu nhiên
+        return bool(gmpy2.is_prime(n))
+
+    @staticmethod
+    def is_probable_prime(n, rounds=None, trial=True):
+        # Cùng chính sách với primality.is_probable_prime, phép tính chạy trong GMP
+        if trial or n < (1 << 30):
+            decided = primality.trial_division(n)
+            if decided is not None:
+                return decided
+        if n < primality._DETERMINISTIC_LIMIT:
+            return all(Gmpy2Backend._strong_prp(n, a) for a in primality._DETERMINISTIC_BASES)
+        if rounds is None:
+            rounds = primality.miller_rabin_rounds(n.bit_length())
+            if rounds > 4:
+                return bool(gmpy2.is_strong_bpsw_prp(n))
+        if not Gmpy2Backend._strong_prp(n, 2):
+            return False
+        return all(Gmpy2Backend._strong_prp(n, entropy.randint(3, n - 2)) for _ in range(rounds - 1))
+
+    @staticmethod
+    def _strong_prp(n, a):
+        # gmpy2 báo lỗi khi gcd(n, a) > 1; khi đó (a < n) n là hợp số
+        if gmpy2.gcd(n, a) != 1:
+            return False
+        return bool(gmpy2.is_strong_prp(n, a))
+
+    @staticmethod
+    def next_prime(n):
+        return int(gmpy2.next_prime(n))
+
+_BACKENDS = {'python': PythonBackend}
+if gmpy2 is not None:
+    _BACKENDS['gmpy2'] = Gmpy2Backend
+
+_backend = _BACKENDS.get('gmpy2', PythonBackend)
+
+def available_backends():
+    """Tên các backend dùng được trong môi trường hiện tại"""
+    return list(_BACKENDS)
+
+def set_backend(name='auto'):
+    """
+    Chọn backend: 'python', 'gmpy2' hoặc 'auto' (gmpy2 nếu có). Trả về tên backend đã chọn.
+    Tiến trình con tạo bằng fork giữ lựa chọn này; tạo bằng spawn thì về lại 'auto'.
+    """
+    global _backend
+    if name == 'auto':
+        name = 'gmpy2' if 'gmpy2' in _BACKENDS else 'python'
+    if name not in _BACKENDS:
+        raise ValueError(f"Backend không khả dụng: {name} (có: {', '.join(_BACKENDS)})")
+    _backend = _BACKENDS[name]
+    return name
+
+def get_backend():
+    return _backend.name
+
+def is_native():
+    """True nếu backend hiện tại chạy trong thư viện C (next_prime nhanh hơn sàng bằng Python)"""
+    return _backend.native
+
+def powmod(base, exp, mod):
+    return _backend.powmod(base, exp, mod)
+
+def invert(a, m):
+    return _backend.invert(a, m)
+
+def gcd(a, b):
+    return _backend.gcd(a, b)
+
+def native_int(x):
+    """Chuyển x sang kiểu số nguyên của backend (mpz với gmpy2) để tính toán dây chuyền"""
+    return _backend.native_int(x)
+
+def is_prime(n):
+    return _backend.is_prime(n)
+
+def is_probable_prime(n, rounds=None, trial=True):
+    return _backend.is_probable_prime(n, rounds, trial)
+
+def next_prime(n):
+    return _backend.next_prime(n)
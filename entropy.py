@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+
+# --- NGUỒN NGẪU NHIÊN MẬT MÃ CÓ BỘ ĐỆM ---
+#
+# Mặc định đọc os.urandom theo khối lớn thay vì gọi từng byte. Mỗi luồng (và mỗi tiến
+# trình sau fork) có bộ đệm riêng nên không cần khóa và không bao giờ dùng chung byte.
+# seed(value) chuyển sang chế độ tất định (SHAKE-256 theo bộ đếm) để benchmark lặp lại
+# được; KHÔNG dùng chế độ này cho khóa thật.
+
+BLOCK_SIZE = 1 << 16
+
+class EntropyPool:
+    """Một dòng byte ngẫu nhiên có bộ đệm: os.urandom, hoặc tất định nếu có seed"""
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        self._key = None if seed is None else hashlib.sha256(_seed_bytes(seed)).digest()
+        self._counter = 0
+        self._buffer = b''
+        self._pos = 0
+        self.pid = os.getpid()
+
+    @property
+    def deterministic(self):
+        return self._key is not None
+
+    def _generate(self, size):
+        if self._key is None:
+            return os.urandom(size)
+        self._counter += 1
+        return hashlib.shake_256(self._key + self._counter.to_bytes(8, 'big')).digest(size)
+
+    def randbytes(self, size):
+        if size > self.block_size:
+            return self._generate(size)
+        if self._pos + size > len(self._buffer):
+            self._buffer = self._buffer[self._pos:] + self._generate(self.block_size)
+            self._pos = 0
+        out = self._buffer[self._pos:self._pos + size]
+        self._pos += size
+        return out
+
+    def nonzero_bytes(self, size):
+        """size byte ngẫu nhiên khác 0 (cho padding PKCS#1): lọc byte 0 theo khối rồi bù thêm"""
+        out = b''
+        while len(out) < size:
+            need = size - len(out)
+            out += self.randbytes(need + (need >> 7) + 8).replace(b'\x00', b'')
+        return out[:size]
+
+    def getrandbits(self, k):
+        if k <= 0:
+            return 0
+        value = int.from_bytes(self.randbytes((k + 7) // 8), 'big')
+        return value >> (-k % 8)
+
+    def randbelow(self, n):
+        """Số ngẫu nhiên đều trong [0, n) (lấy mẫu loại bỏ, không lệch)"""
+        k = n.bit_length()
+        while True:
+            r = self.getrandbits(k)
+            if r < n:
+                return r
+
+    def randint(self, a, b):
+        return a + self.randbelow(b - a + 1)
+
+    def spawn(self, label):
+        """Dòng con độc lập: tất định theo (seed, label) nếu có seed, ngược lại là os.urandom mới"""
+        if self._key is None:
+            return EntropyPool(block_size=self.block_size)
+        return EntropyPool(self._key + _seed_bytes(label), self.block_size)
+
+def _seed_bytes(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if isinstance(value, int):
+        return value.to_bytes((value.bit_length() + 8) // 8, 'big', signed=True)
+    return str(value).encode('utf-8')
+
+# --- DÒNG THEO LUỒNG / TIẾN TRÌNH ---
+
+_root = EntropyPool()
+_generation = 0
+_local = threading.local()
+
+def seed(value=None):
+    """Đặt seed cho chế độ tất định (None: quay lại os.urandom); áp dụng cho mọi luồng"""
+    global _root, _generation
+    _root = EntropyPool(value)
+    _generation += 1
+
+def pool():
+    """Dòng của luồng hiện tại; được tạo lại sau fork để tiến trình con không lặp byte của cha"""
+    current = getattr(_local, 'pool', None)
+    if current is None or current.pid != os.getpid() or _local.generation != _generation:
+        label = threading.current_thread().name
+        if _root.pid != os.getpid():
+            label += f"/{os.getpid()}"
+        current = _local.pool = _root.spawn(label)
+        _local.generation = _generation
+    return current
+
+def worker_seed():
+    """
+    Seed để giao cho một tác vụ ở luồng/tiến trình khác: rút từ dòng hiện tại nếu đang
+    tất định (kết quả lặp lại được), None nếu dùng os.urandom.
+    """
+    current = pool()
+    return current.randbytes(32) if current.deterministic else None
+
+def init_worker(worker_seed):
+    """
+    Gọi ở đầu tác vụ với giá trị từ worker_seed(). None: không cần làm gì (sau fork pool()
+    tự tạo bộ đệm os.urandom mới); có seed: luồng hiện tại chuyển sang dòng tất định đó.
+    """
+    if worker_seed is not None:
+        _local.pool = EntropyPool(worker_seed)
+        _local.generation = _generation
+
+def randbytes(size):
+    return pool().randbytes(size)
+
+def nonzero_bytes(size):
+    return pool().nonzero_bytes(size)
+
+def getrandbits(k):
+    return pool().getrandbits(k)
+
+def randbelow(n):
+    return pool().randbelow(n)
+
+def randint(a, b):
+    return pool().randint(a, b)
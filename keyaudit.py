@@ -0,0 +1,205 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bigint
+import rsa
+
+# --- KIỂM TRA KHÓA YẾU BẰNG BATCH GCD ---
+#
+# Hai khóa RSA dùng chung một số nguyên tố thì gcd(n1, n2) lộ ra thừa số đó. Thay vì
+# O(n²) phép gcd từng cặp, batch GCD (Heninger và cộng sự) tính P = tích mọi n bằng cây
+# tích, rồi P mod n_i² bằng cây số dư; gcd((P mod n_i²) / n_i, n_i) > 1 nghĩa là n_i có
+# chung thừa số với một khóa khác.
+#
+# Giới hạn bộ nhớ: các modulus được chia thành nhóm chunk_size. Mỗi tiến trình con dựng
+# cây tích của một nhóm (tầng dưới); tiến trình chính chỉ giữ cây trên các tích nhóm.
+# Phép nhân/chia số cực lớn cần gmpy2 (bigint) để chạy được với hàng trăm nghìn khóa;
+# với int thuần Python phép chia số lớn là bậc hai nên chỉ phù hợp vài nghìn khóa.
+
+CHUNK_SIZES = [1 << i for i in range(6, 17)]
+
+def product_tree(values):
+    """Các tầng của cây tích: tầng 0 là values, tầng cuối là [tích tất cả]"""
+    tree = [list(values)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)])
+    return tree
+
+def remainder_tree(value, tree):
+    """value mod x² cho mọi x ở tầng lá của tree (đi từ gốc xuống, bình phương tính tại chỗ)"""
+    rems = [value % (tree[-1][0] ** 2)]
+    for level in reversed(tree[:-1]):
+        rems = [rems[i // 2] % (x * x) for i, x in enumerate(level)]
+    return rems
+
+def estimate_memory(count, bits, chunk_size, workers):
+    """Ước lượng bộ nhớ đỉnh (byte): cây trên ở tiến trình chính + cây nhóm ở mỗi tiến trình con"""
+    total = count * bits / 8
+    chunks = math.ceil(count / chunk_size)
+    per_chunk = total / chunks
+    # Mỗi tầng của cây chứa xấp xỉ toàn bộ số bit; cộng thêm gốc, các số dư, bình phương
+    # và danh sách modulus đầu vào (int Python tốn gấp vài lần số byte thô)
+    parent = total * (math.ceil(math.log2(chunks)) + 10)
+    child = per_chunk * (math.ceil(math.log2(max(chunk_size, 2))) + 5)
+    return int(parent + child * workers)
+
+def _choose_chunk_size(count, bits, workers, max_memory):
+    candidates = [c for c in CHUNK_SIZES if c < count] or [count]
+    best = min(candidates, key=lambda c: estimate_memory(count, bits, c, workers))
+    if max_memory is not None and estimate_memory(count, bits, best, workers) > max_memory:
+        raise ValueError("Không đủ bộ nhớ: giảm workers hoặc tăng max_memory")
+    return best
+
+# --- TÁC VỤ CHO TIẾN TRÌNH CON ---
+
+def _chunk_product(moduli):
+    return product_tree([bigint.native_int(n) for n in moduli])[-1][0]
+
+def _chunk_gcds(task):
+    """Cây tích + cây số dư của một nhóm; trả về [(vị trí trong nhóm, gcd)] với gcd > 1"""
+    moduli, remainder = task
+    values = [bigint.native_int(n) for n in moduli]
+    rems = remainder_tree(remainder, product_tree(values))
+    found = []
+    for i, (n, r) in enumerate(zip(values, rems)):
+        g = bigint.gcd(r // n, n)
+        if g != 1:
+            found.append((i, int(g)))
+    return found
+
+def batch_gcd(moduli, workers=None, chunk_size=None, max_memory=None):
+    """
+    gcd(n_i, tích các modulus khác) cho mọi modulus, theo thời gian gần tuyến tính.
+    Các modulus phải khác nhau (trùng nhau cho gcd = n). workers=1 chạy trong tiến trình hiện tại.
+    Returns: dict {vị trí: gcd} chỉ gồm các modulus có gcd > 1
+    """
+    moduli = list(moduli)
+    if len(moduli) < 2:
+        return {}
+    workers = workers or os.cpu_count() or 1
+    bits = max(n.bit_length() for n in moduli)
+    if chunk_size is None:
+        chunk_size = _choose_chunk_size(len(moduli), bits, workers, max_memory)
+    chunks = [moduli[i:i + chunk_size] for i in range(0, len(moduli), chunk_size)]
+
+    if workers == 1:
+        products = [_chunk_product(chunk) for chunk in chunks]
+        top = product_tree(products)
+        results = [_chunk_gcds((chunk, r)) for chunk, r in zip(chunks, remainder_tree(top[-1][0], top))]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            products = list(pool.map(_chunk_product, chunks))
+            top = product_tree(products)
+            remainders = remainder_tree(top[-1][0], top)
+            del top, products
+            results = list(pool.map(_chunk_gcds, zip(chunks, remainders)))
+
+    return {c * chunk_size + i: g for c, found in enumerate(results) for i, g in found}
+
+# --- BÁO CÁO ---
+
+def audit_moduli(moduli, labels=None, workers=None, chunk_size=None, max_memory=None):
+    """
+    Kiểm tra một tập modulus. labels: tên hiển thị cho từng modulus (mặc định là vị trí).
+    Returns: dict gồm
+      moduli, unique: số modulus / số modulus khác nhau
+      duplicates: các nhóm label có cùng modulus (cùng một khóa bị dùng lại)
+      compromised: list dict label, n, p, q, shared_with (các label chung thừa số);
+                   p, q là None nếu cả hai thừa số đều dùng chung và không tách được
+      elapsed: thời gian (giây)
+    """
+    start = time.perf_counter()
+    moduli = list(moduli)
+    labels = list(range(len(moduli))) if labels is None else list(labels)
+    if len(labels) != len(moduli):
+        raise ValueError("labels và moduli phải cùng độ dài")
+
+    positions = {}
+    for i, n in enumerate(moduli):
+        positions.setdefault(n, []).append(i)
+    unique = list(positions)
+    duplicates = [[labels[i] for i in idx] for idx in positions.values() if len(idx) > 1]
+
+    found = batch_gcd(unique, workers, chunk_size, max_memory)
+    # gcd = n: cả p và q đều có ở khóa khác; tách bằng gcd từng cặp trong nhóm nhỏ bị lộ
+    weak = list(found)
+    for i in weak:
+        if found[i] == unique[i]:
+            for j in weak:
+                g = bigint.gcd(unique[i], unique[j]) if j != i else 1
+                if 1 < g < unique[i]:
+                    found[i] = int(g)
+                    break
+
+    factors = {}
+    for i, g in found.items():
+        n = unique[i]
+        p = g if g != n else None
+        factors[i] = (p, n // p if p else None)
+
+    by_prime = {}
+    for i, (p, q) in factors.items():
+        for r in (p, q):
+            if r is not None:
+                by_prime.setdefault(r, set()).add(i)
+
+    compromised = []
+    for i in sorted(factors):
+        p, q = factors[i]
+        sharing = set()
+        for r in (p, q):
+            if r is not None:
+                sharing |= by_prime[r]
+        sharing.discard(i)
+        own = positions[unique[i]]
+        compromised.append({
+            'label': labels[own[0]],
+            'n': unique[i],
+            'p': p,
+            'q': q,
+            'shared_with': sorted((labels[positions[unique[j]][0]] for j in sharing), key=str),
+        })
+
+    return {
+        'moduli': len(moduli),
+        'unique': len(unique),
+        'duplicates': duplicates,
+        'compromised': compromised,
+        'elapsed': time.perf_counter() - start,
+    }
+
+def _load_modulus(data):
+    if b'PRIVATE KEY' in data:
+        return rsa.load_private_key(data).n
+    return rsa.load_public_key(data).n
+
+def audit_files(paths, workers=None, chunk_size=None, max_memory=None):
+    """
+    Kiểm tra các file khóa (PEM của serialize_public_key/serialize_private_key hoặc nhị phân).
+    paths: list đường dẫn hoặc một thư mục (lấy mọi file .pem). Label trong báo cáo là tên file;
+    các file không đọc được nằm trong 'errors'.
+    """
+    if isinstance(paths, (str, os.PathLike)) and os.path.isdir(paths):
+        with os.scandir(paths) as it:
+            paths = sorted(entry.path for entry in it if entry.is_file() and entry.name.endswith('.pem'))
+    moduli, labels, errors = [], [], []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                moduli.append(_load_modulus(f.read()))
+            labels.append(path)
+        except (OSError, ValueError):
+            errors.append(path)
+    report = audit_moduli(moduli, labels, workers, chunk_size, max_memory)
+    report['errors'] = errors
+    return report
+
+def audit_keystore(store, workers=None, chunk_size=None, max_memory=None):
+    """Kiểm tra mọi khóa trong một keystore.KeyStore; label là dấu vân tay dạng hex"""
+    fingerprints = store.fingerprints()
+    moduli = [store.get_public(fp).n for fp in fingerprints]
+    return audit_moduli(moduli, [fp.hex() for fp in fingerprints], workers, chunk_size, max_memory)
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import entropy
+import rsa
+
+class KeyPool:
+    """
+    Kho cặp khóa RSA tạo sẵn theo từng kích thước. Khi số khóa sẵn có (cộng số đang
+    tạo) xuống tới low, các tiến trình nền được giao tạo bù cho tới high.
+    get() trả về ngay nếu còn khóa; hết khóa thì tạo đồng bộ (fallback).
+    """
+    def __init__(self, sizes=(512, 1024, 2048), low=2, high=8, workers=None, use_processes=True):
+        for size in sizes:
+            if size not in [512, 1024, 2048]:
+                raise ValueError("Chỉ hỗ trợ kích thước khóa: 512, 1024, 2048 bits")
+        if not 0 <= low < high:
+            raise ValueError("Cần 0 <= low < high")
+        self.low = low
+        self.high = high
+        self._stock = {size: deque() for size in sizes}
+        self._in_flight = {size: 0 for size in sizes}
+        # RLock: callback của future đã xong có thể chạy ngay trong submit() khi đang giữ khóa
+        self._lock = threading.RLock()
+        self._closed = False
+        self._executor = (ProcessPoolExecutor if use_processes else ThreadPoolExecutor)(max_workers=workers)
+        self.hits = 0
+        self.fallbacks = 0
+        self.generated = 0
+        self.errors = 0
+        self._started = time.perf_counter()
+        with self._lock:
+            for size in sizes:
+                self._refill(size, force=True)
+
+    def _refill(self, size, force=False):
+        # Gọi khi đang giữ khóa: đủ điều kiện thì giao tạo bù lên high
+        have = len(self._stock[size]) + self._in_flight[size]
+        if self._closed or (have > self.low and not force):
+            return
+        for _ in range(self.high - have):
+            self._in_flight[size] += 1
+            future = self._executor.submit(rsa._generate_key_pair_seeded, size, entropy.worker_seed())
+            future.add_done_callback(lambda f, size=size: self._on_generated(size, f))
+
+    def _on_generated(self, size, future):
+        with self._lock:
+            self._in_flight[size] -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.errors += 1
+            else:
+                self._stock[size].append(future.result())
+                self.generated += 1
+            self._refill(size)
+
+    def get(self, key_size=1024):
+        """Lấy một cặp (private_key, public_key); mỗi cặp chỉ được trả ra một lần"""
+        if key_size not in self._stock:
+            raise ValueError(f"Kho không có khóa {key_size} bits")
+        with self._lock:
+            stock = self._stock[key_size]
+            if stock:
+                self.hits += 1
+                pair = stock.popleft()
+                self._refill(key_size)
+                return pair
+            self.fallbacks += 1
+            self._refill(key_size)
+        return rsa.generate_key_pair(key_size)
+
+    def stats(self):
+        """Số liệu: độ sâu kho, số khóa đang tạo, hits/fallbacks, tốc độ tạo bù (khóa/giây)"""
+        with self._lock:
+            elapsed = time.perf_counter() - self._started
+            return {
+                'depth': {size: len(stock) for size, stock in self._stock.items()},
+                'in_flight': dict(self._in_flight),
+                'hits': self.hits,
+                'fallbacks': self.fallbacks,
+                'generated': self.generated,
+                'errors': self.errors,
+                'refill_rate': self.generated / elapsed if elapsed else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,286 @@
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+import rsa
+
+# --- KHO KHÓA RSA TRÊN ĐĨA, TRA CỨU THEO DẤU VÂN TAY ---
+#
+# Một file duy nhất:
+#   Header: STORE_MAGIC | vị trí bảng chỉ mục (8 byte) | số mục (8 byte)
+#   Các bản ghi khóa (định dạng nhị phân gọn của rsa.serialize_*_binary), chỉ ghi nối thêm
+#   Bảng chỉ mục: các mục cố định INDEX_ENTRY byte = SHA-256(n) | vị trí | độ dài, sắp xếp
+#   theo dấu vân tay để tìm nhị phân trực tiếp trên mmap (O(log n), không nạp cả kho).
+# commit() ghi các bản ghi mới và bảng chỉ mục mới ở cuối file rồi mới đổi header, nên
+# nếu bị ngắt giữa chừng header vẫn trỏ tới bảng cũ còn nguyên. Bảng cũ thành vùng chết;
+# compact() ghi lại file không còn vùng chết.
+
+STORE_MAGIC = b'RSKS\x01'
+HEADER_SIZE = len(STORE_MAGIC) + 8 + 8
+FINGERPRINT_SIZE = 32
+INDEX_ENTRY = FINGERPRINT_SIZE + 8 + 4
+
+def fingerprint(key):
+    """Dấu vân tay của khóa (public hoặc private): SHA-256 của n dạng big-endian"""
+    n = key.n
+    return hashlib.sha256(n.to_bytes((n.bit_length() + 7) // 8, 'big')).digest()
+
+def _as_fingerprint(value):
+    # Nhận bytes 32 byte hoặc chuỗi hex
+    if isinstance(value, str):
+        value = bytes.fromhex(value)
+    if len(value) != FINGERPRINT_SIZE:
+        raise ValueError("Dấu vân tay phải là SHA-256 (32 byte)")
+    return bytes(value)
+
+def _is_private_record(record):
+    return record[len(rsa.KEY_MAGIC)] == rsa._KIND_PRIVATE
+
+def _load_key(data):
+    # PEM: loại khóa theo header; nhị phân (gọn hoặc DER): thử public rồi private
+    if b'PRIVATE KEY' in data:
+        return rsa.load_private_key(data)
+    if b'PUBLIC KEY' in data:
+        return rsa.load_public_key(data)
+    try:
+        return rsa.load_public_key(data)
+    except ValueError:
+        return rsa.load_private_key(data)
+
+class KeyStore:
+    """
+    Kho khóa mở trên một file. add() chỉ đưa khóa vào hàng chờ; commit() ghi xuống đĩa.
+    Khóa private thay thế khóa public cùng n; thêm lại khóa đã có thì bỏ qua.
+    Khóa đã giải mã được giữ trong bộ nhớ đệm LRU (cache_size mục).
+    """
+    def __init__(self, path, cache_size=1024):
+        if cache_size < 1:
+            raise ValueError("cache_size phải lớn hơn 0")
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as f:
+                f.write(STORE_MAGIC + HEADER_SIZE.to_bytes(8, 'big') + bytes(8))
+        self._file = open(path, 'r+b')
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._cache = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._map()
+
+    def _map(self):
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(STORE_MAGIC)] != STORE_MAGIC:
+            self._mm.close()
+            self._file.close()
+            raise ValueError("Not a key store")
+        pos = len(STORE_MAGIC)
+        self._index_offset = int.from_bytes(self._mm[pos:pos + 8], 'big')
+        self._count = int.from_bytes(self._mm[pos + 8:pos + 16], 'big')
+        if self._index_offset + self._count * INDEX_ENTRY > len(self._mm):
+            raise ValueError("Key store index is truncated")
+
+    # --- TRA CỨU ---
+
+    def _fingerprint_at(self, i):
+        pos = self._index_offset + i * INDEX_ENTRY
+        return self._mm[pos:pos + FINGERPRINT_SIZE]
+
+    def _find(self, fp):
+        """Tìm nhị phân trên bảng chỉ mục; trả về (vị trí, độ dài) của bản ghi hoặc None"""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._fingerprint_at(mid) < fp:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._fingerprint_at(lo) == fp:
+            pos = self._index_offset + lo * INDEX_ENTRY + FINGERPRINT_SIZE
+            return int.from_bytes(self._mm[pos:pos + 8], 'big'), int.from_bytes(self._mm[pos + 8:pos + 12], 'big')
+        return None
+
+    def _decode(self, record):
+        if _is_private_record(record):
+            return rsa.load_private_key_binary(record)
+        return rsa.load_public_key_binary(record)
+
+    def get(self, fp):
+        """Khóa theo dấu vân tay (bytes hoặc hex); KeyError nếu không có"""
+        fp = _as_fingerprint(fp)
+        with self._lock:
+            key = self._cache.get(fp)
+            if key is not None:
+                self._cache.move_to_end(fp)
+                self.hits += 1
+                return key
+            self.misses += 1
+            if fp in self._pending:
+                return self._pending[fp][1]
+            found = self._find(fp)
+            if found is None:
+                raise KeyError(fp.hex())
+            offset, length = found
+            key = self._decode(memoryview(self._mm)[offset:offset + length])
+            self._cache[fp] = key
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+            return key
+
+    def get_public(self, fp):
+        key = self.get(fp)
+        return key.public_key() if isinstance(key, rsa.MyRSAPrivateKey) else key
+
+    def __contains__(self, fp):
+        fp = _as_fingerprint(fp)
+        with self._lock:
+            return fp in self._pending or self._find(fp) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._count + sum(1 for fp in self._pending if self._find(fp) is None)
+
+    def fingerprints(self):
+        """Các dấu vân tay đã commit, theo thứ tự tăng dần"""
+        with self._lock:
+            return [bytes(self._fingerprint_at(i)) for i in range(self._count)]
+
+    # --- GHI ---
+
+    def add(self, key):
+        """Đưa khóa vào hàng chờ ghi; trả về dấu vân tay"""
+        fp = fingerprint(key)
+        private = isinstance(key, rsa.MyRSAPrivateKey)
+        record = rsa.serialize_private_key_binary(key) if private else rsa.serialize_public_key_binary(key)
+        with self._lock:
+            old = self._pending.get(fp)
+            if old is None or (private and not _is_private_record(old[0])):
+                self._pending[fp] = (record, key)
+                self._cache.pop(fp, None)
+        return fp
+
+    def commit(self):
+        """Ghi các khóa trong hàng chờ; trả về số bản ghi mới"""
+        with self._lock:
+            entries = {}
+            for i in range(self._count):
+                pos = self._index_offset + i * INDEX_ENTRY
+                entries[self._mm[pos:pos + FINGERPRINT_SIZE]] = self._mm[pos + FINGERPRINT_SIZE:pos + INDEX_ENTRY]
+
+            records = []
+            for fp, (record, _) in self._pending.items():
+                if fp in entries:
+                    offset = int.from_bytes(entries[fp][:8], 'big')
+                    # Chỉ ghi đè khi khóa mới là private còn bản đã lưu là public
+                    if not _is_private_record(record) or _is_private_record(self._mm[offset:offset + len(rsa.KEY_MAGIC) + 1]):
+                        continue
+                records.append((fp, record))
+            if not records:
+                self._pending.clear()
+                return 0
+
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            data = bytearray()
+            for fp, record in records:
+                entries[fp] = (offset + len(data)).to_bytes(8, 'big') + len(record).to_bytes(4, 'big')
+                data += record
+            index_offset = offset + len(data)
+            data += b''.join(fp + entries[fp] for fp in sorted(entries))
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            # Đổi header sau cùng: bảng chỉ mục mới chỉ có hiệu lực khi đã nằm trọn trên đĩa
+            self._file.seek(len(STORE_MAGIC))
+            self._file.write(index_offset.to_bytes(8, 'big') + len(entries).to_bytes(8, 'big'))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            self._mm.close()
+            self._map()
+            for fp, _ in records:
+                self._cache.pop(fp, None)
+            self._pending.clear()
+            return len(records)
+
+    def import_directory(self, directory, suffix='.pem'):
+        """
+        Nhập mọi file khóa (PEM của serialize_public_key/serialize_private_key hoặc nhị phân)
+        trong thư mục rồi commit một lần.
+        Returns: dict gồm imported, skipped (trùng), errors (list tên file lỗi)
+        """
+        errors = []
+        seen = set()
+        skipped = 0
+        with os.scandir(directory) as it:
+            names = sorted(entry.name for entry in it if entry.is_file() and entry.name.endswith(suffix))
+        for name in names:
+            with open(os.path.join(directory, name), 'rb') as f:
+                data = f.read()
+            try:
+                key = _load_key(data)
+            except ValueError:
+                errors.append(name)
+                continue
+            fp = self.add(key)
+            if fp in seen:
+                skipped += 1
+            seen.add(fp)
+        imported = self.commit()
+        return {'imported': imported, 'skipped': len(seen) - imported + skipped, 'errors': errors}
+
+    def compact(self):
+        """Ghi lại file chỉ gồm các bản ghi đang được chỉ mục trỏ tới (bỏ vùng chết)"""
+        self.commit()
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            data = bytearray()
+            index = bytearray()
+            for i in range(self._count):
+                pos = self._index_offset + i * INDEX_ENTRY
+                offset = int.from_bytes(self._mm[pos + FINGERPRINT_SIZE:pos + FINGERPRINT_SIZE + 8], 'big')
+                length = int.from_bytes(self._mm[pos + FINGERPRINT_SIZE + 8:pos + INDEX_ENTRY], 'big')
+                index += self._mm[pos:pos + FINGERPRINT_SIZE]
+                index += (HEADER_SIZE + len(data)).to_bytes(8, 'big') + length.to_bytes(4, 'big')
+                data += self._mm[offset:offset + length]
+            with open(tmp_path, 'wb') as f:
+                f.write(STORE_MAGIC + (HEADER_SIZE + len(data)).to_bytes(8, 'big') + self._count.to_bytes(8, 'big'))
+                f.write(data)
+                f.write(index)
+                f.flush()
+                os.fsync(f.fileno())
+            self._mm.close()
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, 'r+b')
+            self._map()
+
+    def stats(self):
+        """Số liệu: số khóa, số khóa chờ ghi, kích thước file, hits/misses/evictions của LRU"""
+        with self._lock:
+            return {
+                'keys': self._count,
+                'pending': len(self._pending),
+                'file_size': len(self._mm),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'cache_size': len(self._cache),
+            }
+
+    def close(self):
+        with self._lock:
+            self._mm.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
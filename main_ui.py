@@ -1,5 +1,6 @@
 import sys
 import os
+import re
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QTextEdit, QRadioButton,
@@ -7,12 +8,15 @@ from PyQt5.QtWidgets import (
     QStackedWidget, QGraphicsDropShadowEffect, QComboBox, QGridLayout
 )
 from PyQt5.QtCore import Qt, QRegExp, QPointF
-from PyQt5.QtGui import QFont, QColor, QCursor, QPainter, QPen, QBrush, QPolygonF, QRegExpValidator
+from PyQt5.QtGui import QFont, QColor, QCursor, QPainter, QPen, QBrush, QPolygonF, QRegExpValidator, QTextCursor
 
 # Import logic
 import playfair
 import rsa
 
+# Ký tự ngoài BMP chiếm 2 vị trí trong QTextDocument
+WIDE_CHAR_RE = re.compile('[\U00010000-\U0010FFFF]')
+
 # ==================== CUSTOM COMBOBOX ====================
 class CustomComboBox(QComboBox):
     def paintEvent(self, event):
@@ -45,6 +49,9 @@ class CryptoApp(QMainWindow):
         
         # Playfair state
         self.playfair_matrix = []
+        self.playfair_cipher = None
+        self.playfair_incremental = None
+        self.playfair_result_wide = False
         self.playfair_matrix_size = '5'
         self.playfair_mode = 'encrypt'
         self.playfair_input_mode = 'file'
@@ -714,10 +721,8 @@ class CryptoApp(QMainWindow):
 
     def generate_and_show_playfair_matrix(self):
         key = self.playfair_key.text()
-        if self.playfair_matrix_size == '5':
-            self.playfair_matrix = playfair.generate_matrix_5x5(key)
-        else:
-            self.playfair_matrix = playfair.generate_matrix_6x6(key)
+        self.playfair_cipher = playfair.get_cipher(key, self.playfair_matrix_size)
+        self.playfair_matrix = self.playfair_cipher.matrix
         self.render_playfair_matrix(self.playfair_matrix)
 
     def render_playfair_matrix(self, matrix_data):
@@ -815,6 +820,12 @@ class CryptoApp(QMainWindow):
         mode = 'encrypt' if self.playfair_radio_encrypt.isChecked() else 'decrypt'
         
         try:
+            if self.playfair_input_mode == 'text':
+                self.playfair_run_incremental(input_text, mode, sep1, sep2)
+                return
+            # Các ô kết quả sắp bị ghi đè: engine không còn khớp với nội dung hiển thị
+            self.playfair_incremental = None
+
             if self.playfair_matrix_size == '5':
                 pairs, inserted_indices = playfair.process_plaintext_5x5(input_text, sep1=sep1, sep2=sep2)
             else:
@@ -822,47 +833,62 @@ class CryptoApp(QMainWindow):
             
             self.playfair_out_pairs.setText(' '.join(pairs))
             
-            processed_pairs = []
-            for pair in pairs:
-                if len(pair) == 2:
-                    if mode == 'encrypt':
-                        processed_pairs.append(playfair.encrypt_pair(self.playfair_matrix, pair[0], pair[1]))
-                    else:
-                        processed_pairs.append(playfair.decrypt_pair(self.playfair_matrix, pair[0], pair[1]))
+            if mode == 'encrypt':
+                processed_pairs = self.playfair_cipher.encrypt_pairs(pairs)
+            else:
+                processed_pairs = self.playfair_cipher.decrypt_pairs(pairs)
             
-            output_stream = ''.join(processed_pairs)
+            output_stream = processed_pairs.stream
             self.playfair_out_stream.setText(' '.join(processed_pairs))
             
-            result = []
-            idx = 0
-            for char in input_text:
-                is_valid = playfair.is_ascii_letter(char) if self.playfair_matrix_size == '5' else playfair.is_ascii_alnum(char)
-                
-                if is_valid:
-                    if idx < len(output_stream):
-                        c = output_stream[idx]
-                        result.append(c.lower() if char.islower() else c)
-                        idx += 1
-                        while idx in inserted_indices and idx < len(output_stream):
-                            result.append(output_stream[idx])
-                            idx += 1
-                else:
-                    result.append(char)
-            
-            while idx < len(output_stream):
-                result.append(output_stream[idx])
-                idx += 1
-                
-            self.playfair_out_result.setText(''.join(result))
+            result = playfair.restore_text(input_text, output_stream, inserted_indices, self.playfair_matrix_size)
+            self.playfair_out_result.setText(result)
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
 
+    def playfair_run_incremental(self, input_text, mode, sep1, sep2):
+        # Văn bản nhập tay thường chỉ sửa vài ký tự giữa các lần chạy:
+        # giữ engine để chỉ tính lại đoạn bị ảnh hưởng
+        engine = self.playfair_incremental
+        # Vị trí trong QTextDocument tính theo UTF-16 nên bản vá (chỉ số chuỗi Python) chỉ đúng
+        # khi cả nội dung đang hiển thị lẫn văn bản mới không có ký tự ngoài BMP (emoji...).
+        # Hai ô chuỗi cặp chỉ chứa chữ ASCII nên luôn vá được.
+        wide = WIDE_CHAR_RE.search(input_text) is not None
+        if (engine is None or engine.cipher is not self.playfair_cipher or engine.mode != mode
+                or engine.sep1 != sep1 or engine.sep2 != sep2):
+            engine = playfair.IncrementalPlayfair(self.playfair_cipher, mode, sep1, sep2)
+            engine.set_text(input_text)
+            self.playfair_incremental = engine
+            # setPlainText: nội dung ô phải trùng từng ký tự với kết quả để các lần vá sau đúng vị trí
+            self.playfair_out_pairs.setPlainText(' '.join(re.findall('..?', engine.plain_stream, re.S)))
+            self.playfair_out_stream.setPlainText(' '.join(re.findall('..?', engine.output_stream, re.S)))
+            self.playfair_out_result.setPlainText(engine.result)
+        else:
+            engine.update(input_text)
+            patches = engine.last_patches
+            self.apply_text_patch(self.playfair_out_pairs, patches['plain_stream'])
+            self.apply_text_patch(self.playfair_out_stream, patches['output_stream'])
+            if wide or self.playfair_result_wide:
+                self.playfair_out_result.setPlainText(engine.result)
+            else:
+                self.apply_text_patch(self.playfair_out_result, patches['result'])
+        self.playfair_result_wide = wide
+
+    def apply_text_patch(self, widget, patch):
+        """Thay đoạn [start, end) của ô văn bản bằng replacement, không dựng lại toàn bộ nội dung"""
+        start, end, replacement = patch
+        cursor = QTextCursor(widget.document())
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.insertText(replacement)
+
     def playfair_clear_all(self):
         self.playfair_text_area.clear()
         self.playfair_file_display.clear()
         self.playfair_file_content = ''
         self.playfair_file_path = ''
+        self.playfair_incremental = None
         self.playfair_out_pairs.clear()
         self.playfair_out_stream.clear()
         self.playfair_out_result.clear()
@@ -953,12 +979,13 @@ Cách hoạt động:
 
     def rsa_import_public_key(self):
         try:
-            filename, _ = QFileDialog.getOpenFileName(self, 'Open Public Key', '', "PEM files (*.pem);;All files (*.*)")
+            filename, _ = QFileDialog.getOpenFileName(self, 'Open Public Key', '', "Key files (*.pem *.der *.key);;All files (*.*)")
             if filename:
                 with open(filename, 'rb') as f:
                     key_data = f.read()
-                self.rsa_public_key = rsa.load_public_key(key_data.decode('utf-8'))
-                self.rsa_public_key_pem = key_data.decode('utf-8')
+                # load_public_key nhận cả PEM lẫn khóa nhị phân; luôn hiển thị dạng PEM
+                self.rsa_public_key = rsa.load_public_key(key_data)
+                self.rsa_public_key_pem = rsa.serialize_public_key(self.rsa_public_key)
                 self.rsa_public_key_display.setText(self.rsa_public_key_pem)
                 QMessageBox.information(self, "Success", "Public key imported successfully!")
         except Exception as e:
@@ -966,12 +993,12 @@ Cách hoạt động:
 
     def rsa_import_private_key(self):
         try:
-            filename, _ = QFileDialog.getOpenFileName(self, 'Open Private Key', '', "PEM files (*.pem);;All files (*.*)")
+            filename, _ = QFileDialog.getOpenFileName(self, 'Open Private Key', '', "Key files (*.pem *.der *.key);;All files (*.*)")
             if filename:
                 with open(filename, 'rb') as f:
                     key_data = f.read()
-                self.rsa_private_key = rsa.load_private_key(key_data.decode('utf-8'))
-                self.rsa_private_key_pem = key_data.decode('utf-8')
+                self.rsa_private_key = rsa.load_private_key(key_data)
+                self.rsa_private_key_pem = rsa.serialize_private_key(self.rsa_private_key)
                 self.rsa_private_key_display.setText(self.rsa_private_key_pem)
                 self.rsa_public_key = self.rsa_private_key.public_key()
                 self.rsa_public_key_pem = rsa.serialize_public_key(self.rsa_public_key)
@@ -996,7 +1023,12 @@ Cách hoạt động:
             if not plaintext:
                 QMessageBox.warning(self, "Warning", "Please enter text to encrypt!")
                 return
-            encrypted_base64 = rsa.encrypt(plaintext, self.rsa_public_key)
+            k = (self.rsa_public_key.n.bit_length() + 7) // 8
+            if len(plaintext.encode('utf-8')) > k - 11:
+                # Quá dài cho một khối RSA: dùng phong bì RSA + AES-GCM
+                encrypted_base64 = rsa.encrypt_envelope(plaintext, self.rsa_public_key)
+            else:
+                encrypted_base64 = rsa.encrypt(plaintext, self.rsa_public_key)
             self.rsa_output_text.setText(encrypted_base64)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Encryption failed: {str(e)}")
@@ -1010,7 +1042,10 @@ Cách hoạt động:
             if not ciphertext_base64:
                 QMessageBox.warning(self, "Warning", "Please enter base64 text to decrypt!")
                 return
-            plaintext = rsa.decrypt(ciphertext_base64, self.rsa_private_key)
+            if rsa.is_envelope(ciphertext_base64):
+                plaintext = rsa.decrypt_envelope(ciphertext_base64, self.rsa_private_key)
+            else:
+                plaintext = rsa.decrypt(ciphertext_base64, self.rsa_private_key)
             self.rsa_output_text.setText(plaintext)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Decryption failed: {str(e)}")
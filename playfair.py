@@ -1,3 +1,22 @@
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là tùy chọn: thiếu thì dùng bảng tra thuần Python
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Chuỗi ngắn hơn ngưỡng này dùng bảng tra Python (chi phí dựng mảng không đáng)
+NUMPY_MIN_LENGTH = 4096
+
 # --- CÁC HÀM XỬ LÝ LOGIC PLAYFAIR ---
 
 def is_ascii_letter(char):
@@ -40,73 +59,64 @@ def find_position(matrix, char):
 
 # --- HÀM XỬ LÝ VĂN BẢN (DÙNG CHUNG CHO CẢ MÃ HÓA VÀ GIẢI MÃ) ---
 
+class PairList(Sequence):
+    """
+    Danh sách cặp chỉ đọc trên một chuỗi liền (1 byte/ký tự với ASCII):
+    từng cặp 2 ký tự chỉ được cắt ra khi truy cập, thay vì giữ sẵn một str mỗi cặp.
+    """
+    __slots__ = ('stream',)
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __len__(self):
+        return len(self.stream) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("pair index out of range")
+        return self.stream[2 * index:2 * index + 2]
+
+    def __iter__(self):
+        stream = self.stream
+        return (stream[i:i + 2] for i in range(0, len(stream), 2))
+
+    def __eq__(self, other):
+        if isinstance(other, PairList):
+            return self.stream == other.stream
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PairList({self.stream!r})"
+
+class PairedText(namedtuple('PairedText', ['pairs', 'inserted_indices'])):
+    """
+    Kết quả tách cặp: pairs là PairList, inserted_indices là array('I').
+    Vẫn unpack được như trước: pairs, inserted_indices = process_plaintext_5x5(...)
+    """
+    __slots__ = ()
+
+    @property
+    def stream(self):
+        return self.pairs.stream
+
+def _paired_text(text, size, sep1, sep2):
+    stream, inserted, _ = _pair_text(normalize_text(text, size), sep1, sep2)
+    return PairedText(PairList(stream), array('I', inserted))
+
 def process_plaintext_5x5(text, sep1='X', sep2='Y'):
     """Xử lý văn bản 5x5: Tách cặp, chèn sep1/sep2 nếu trùng hoặc lẻ"""
-    filtered_text = []
-    for char in text:
-        if is_ascii_letter(char):
-            filtered_text.append(char.upper().replace('J', 'I'))
-    text = ''.join(filtered_text)
-    
-    pairs = []
-    inserted_indices = [] 
-    i = 0
-    char_count = 0 
-    
-    while i < len(text):
-        a = text[i]
-        if i + 1 < len(text):
-            b = text[i + 1]
-            if a == b:
-                if a == sep1: pairs.append(a + sep2)
-                else: pairs.append(a + sep1)
-                inserted_indices.append(char_count + 1)
-                i += 1
-                char_count += 2
-            else:
-                pairs.append(a + b)
-                i += 2
-                char_count += 2
-        else:
-            if a == sep1: pairs.append(a + sep2) 
-            else: pairs.append(a + sep1) 
-            inserted_indices.append(char_count + 1)
-            i += 1
-            char_count += 2
-    
-    return pairs, inserted_indices
+    return _paired_text(text, 5, sep1, sep2)
 
 def process_plaintext_6x6(text, sep1='X', sep2='Y'):
     """Xử lý văn bản 6x6: Tách cặp, chèn sep1/sep2 nếu trùng hoặc lẻ"""
-    text = ''.join([c.upper() for c in text if is_ascii_alnum(c)])
-    
-    pairs = []
-    inserted_indices = [] 
-    i = 0
-    char_count = 0
-    
-    while i < len(text):
-        a = text[i]
-        if i + 1 < len(text):
-            b = text[i + 1]
-            if a == b:
-                if a == sep1: pairs.append(a + sep2)
-                else: pairs.append(a + sep1)
-                inserted_indices.append(char_count + 1)
-                i += 1
-                char_count += 2
-            else:
-                pairs.append(a + b)
-                i += 2
-                char_count += 2
-        else:
-            if a == sep1: pairs.append(a + sep2) 
-            else: pairs.append(a + sep1) 
-            inserted_indices.append(char_count + 1)
-            i += 1
-            char_count += 2
-    
-    return pairs, inserted_indices
+    return _paired_text(text, 6, sep1, sep2)
 
 # --- CÁC HÀM TÍNH TOÁN ---
 
@@ -136,3 +146,696 @@ def decrypt_pair(matrix, a, b):
     else: 
         return matrix[row_a][col_b] + matrix[row_b][col_a]
 
+
+# --- BẢNG TRA CỨU DỰNG SẴN (TĂNG TỐC MÃ HÓA HÀNG LOẠT) ---
+
+class PlayfairCipher:
+    """
+    Đối tượng Playfair dựng một lần từ ma trận: chỉ mục ký tự -> (hàng, cột)
+    và bảng mã hóa/giải mã đầy đủ cho mọi cặp (625 cặp với 5x5, 1296 cặp với 6x6).
+    """
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.size = len(matrix)
+        self.alphabet = ''.join(''.join(row) for row in matrix)
+        self.positions = {c: (i, j) for i, row in enumerate(matrix) for j, c in enumerate(row)}
+
+        self.encrypt_table = {}
+        self.decrypt_table = {}
+        for a in self.alphabet:
+            for b in self.alphabet:
+                self.encrypt_table[a + b] = encrypt_pair(matrix, a, b)
+                self.decrypt_table[a + b] = decrypt_pair(matrix, a, b)
+        self._np_tables = None
+
+    @classmethod
+    def from_key(cls, key, size='5'):
+        """Tạo cipher từ khóa với kích thước ma trận '5' hoặc '6'"""
+        if str(size) == '5':
+            return cls(generate_matrix_5x5(key))
+        return cls(generate_matrix_6x6(key))
+
+    def process_text(self, text, sep1='X', sep2='Y'):
+        """Tách cặp theo đúng quy tắc của ma trận hiện tại"""
+        if self.size == 5:
+            return process_plaintext_5x5(text, sep1=sep1, sep2=sep2)
+        return process_plaintext_6x6(text, sep1=sep1, sep2=sep2)
+
+    def encrypt_pairs(self, pairs):
+        """Mã hóa danh sách cặp; cặp có ký tự ngoài ma trận giữ nguyên như encrypt_pair"""
+        if isinstance(pairs, PairList):
+            return PairList(self.encrypt_stream(pairs.stream))
+        table = self.encrypt_table
+        return [table.get(pair, pair) for pair in pairs]
+
+    def decrypt_pairs(self, pairs):
+        """Giải mã danh sách cặp; cặp có ký tự ngoài ma trận giữ nguyên như decrypt_pair"""
+        if isinstance(pairs, PairList):
+            return PairList(self.decrypt_stream(pairs.stream))
+        table = self.decrypt_table
+        return [table.get(pair, pair) for pair in pairs]
+
+    def _numpy_tables(self):
+        """
+        Bảng cho đường NumPy, dựng khi dùng lần đầu: bảng dịch ký tự -> mã (ký tự
+        ngoài ma trận nhận mã N) và bảng ((N+1)², 2) byte ASCII của cặp kết quả.
+        """
+        if self._np_tables is None:
+            n = len(self.alphabet)
+            to_code = bytearray([n]) * 256
+            for i, c in enumerate(self.alphabet):
+                to_code[ord(c)] = i
+            enc = np.zeros(((n + 1) * (n + 1), 2), dtype=np.uint8)
+            dec = np.zeros(((n + 1) * (n + 1), 2), dtype=np.uint8)
+            for i, a in enumerate(self.alphabet):
+                for j, b in enumerate(self.alphabet):
+                    enc[i * (n + 1) + j] = tuple(self.encrypt_table[a + b].encode('ascii'))
+                    dec[i * (n + 1) + j] = tuple(self.decrypt_table[a + b].encode('ascii'))
+            self._np_tables = (bytes(to_code), enc, dec)
+        return self._np_tables
+
+    def _translate_numpy(self, stream, table):
+        """Mã hóa/giải mã cả chuỗi cặp bằng fancy indexing, không vòng lặp Python theo cặp"""
+        n = len(self.alphabet)
+        to_code = self._np_tables[0]
+        raw = stream.encode('ascii')
+        codes = np.frombuffer(raw.translate(to_code), dtype=np.uint8).reshape(-1, 2).astype(np.intp)
+        out = table[codes[:, 0] * (n + 1) + codes[:, 1]]
+        # Cặp có ký tự ngoài ma trận giữ nguyên như encrypt_pair/decrypt_pair
+        bad = (codes == n).any(axis=1)
+        if bad.any():
+            out[bad] = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 2)[bad]
+        return out.tobytes().decode('ascii')
+
+    def _use_numpy(self, stream):
+        return (np is not None and len(stream) >= NUMPY_MIN_LENGTH
+                and self.alphabet.isascii() and stream.isascii())
+
+    def encrypt_stream(self, stream):
+        """Mã hóa chuỗi đã tách cặp (độ dài chẵn, ví dụ ''.join(pairs))"""
+        table = self.encrypt_table
+        if self._use_numpy(stream):
+            even = len(stream) - len(stream) % 2
+            return self._translate_numpy(stream[:even], self._numpy_tables()[1]) + stream[even:]
+        return ''.join([table.get(stream[i:i + 2], stream[i:i + 2]) for i in range(0, len(stream), 2)])
+
+    def decrypt_stream(self, stream):
+        """Giải mã chuỗi đã tách cặp (độ dài chẵn, ví dụ ''.join(pairs))"""
+        table = self.decrypt_table
+        if self._use_numpy(stream):
+            even = len(stream) - len(stream) % 2
+            return self._translate_numpy(stream[:even], self._numpy_tables()[2]) + stream[even:]
+        return ''.join([table.get(stream[i:i + 2], stream[i:i + 2]) for i in range(0, len(stream), 2)])
+
+    def encrypt_chunks(self, chunks, sep1='X', sep2='Y'):
+        """Mã hóa dạng luồng: nhận iterator các đoạn văn bản, sinh ra các đoạn bản mã"""
+        for stream in iter_pair_stream(chunks, self.size, sep1=sep1, sep2=sep2):
+            yield self.encrypt_stream(stream)
+
+    def decrypt_chunks(self, chunks, sep1='X', sep2='Y'):
+        """Giải mã dạng luồng: nhận iterator các đoạn văn bản, sinh ra các đoạn bản rõ"""
+        for stream in iter_pair_stream(chunks, self.size, sep1=sep1, sep2=sep2):
+            yield self.decrypt_stream(stream)
+
+    def encrypt_parallel(self, text, sep1='X', sep2='Y', workers=None, chunk_size=1 << 22):
+        """Mã hóa văn bản lớn bằng nhiều tiến trình; kết quả trùng với encrypt()"""
+        return _run_parallel(self, text, 'encrypt', sep1, sep2, workers, chunk_size)
+
+    def decrypt_parallel(self, text, sep1='X', sep2='Y', workers=None, chunk_size=1 << 22):
+        """Giải mã văn bản lớn bằng nhiều tiến trình; kết quả trùng với decrypt()"""
+        return _run_parallel(self, text, 'decrypt', sep1, sep2, workers, chunk_size)
+
+    def encrypt_file(self, src_path, dst_path, sep1='X', sep2='Y', block_size=1 << 22):
+        """Mã hóa file sang file qua mmap, giữ định dạng như kết quả trên giao diện"""
+        return _process_file(self, src_path, dst_path, 'encrypt', sep1, sep2, block_size)
+
+    def decrypt_file(self, src_path, dst_path, sep1='X', sep2='Y', block_size=1 << 22):
+        """Giải mã file sang file qua mmap, giữ định dạng như kết quả trên giao diện"""
+        return _process_file(self, src_path, dst_path, 'decrypt', sep1, sep2, block_size)
+
+    def encrypt(self, text, sep1='X', sep2='Y'):
+        """Tách cặp văn bản thô rồi mã hóa; trả về chuỗi bản mã liền nhau"""
+        stream, _, _ = _pair_text(normalize_text(text, self.size), sep1, sep2)
+        return self.encrypt_stream(stream)
+
+    def decrypt(self, text, sep1='X', sep2='Y'):
+        """Tách cặp văn bản thô rồi giải mã; trả về chuỗi bản rõ liền nhau"""
+        stream, _, _ = _pair_text(normalize_text(text, self.size), sep1, sep2)
+        return self.decrypt_stream(stream)
+
+# --- KHÔI PHỤC ĐỊNH DẠNG KẾT QUẢ ---
+
+def restore_text(source, output_stream, inserted_indices, size='5', is_valid=None):
+    """
+    Ghép kết quả về định dạng văn bản gốc: giữ nguyên ký tự không hợp lệ
+    (dấu câu, khoảng trắng...), khôi phục chữ thường và chèn các separator
+    ngay sau ký tự đứng trước chúng. Vị trí separator được đánh dấu trong
+    bitmap nên toàn bộ quá trình chạy tuyến tính theo độ dài văn bản.
+    is_valid: hàm kiểm tra ký tự hợp lệ, mặc định theo kích thước ma trận.
+    """
+    result, idx = _restore(source, output_stream, inserted_indices, size, is_valid)
+    return result + output_stream[idx:]
+
+def _restore(source, output_stream, inserted_indices, size='5', is_valid=None):
+    """
+    Phần chính của restore_text, không ghép phần output thừa ở cuối (khi một ký tự
+    nguồn chuẩn hóa thành nhiều chữ, ví dụ ß -> SS).
+    Returns: (kết quả, vị trí đầu phần output chưa dùng)
+    """
+    if is_valid is None:
+        is_valid = is_ascii_letter if int(size) == 5 else is_ascii_alnum
+    n = len(output_stream)
+    inserted = bytearray(n + 1)
+    for i in inserted_indices:
+        if i <= n:
+            inserted[i] = 1
+
+    valid_cache = {}
+    result = []
+    idx = 0
+    for char in source:
+        valid = valid_cache.get(char)
+        if valid is None:
+            valid = valid_cache[char] = is_valid(char)
+        if valid:
+            if idx < n:
+                c = output_stream[idx]
+                result.append(c.lower() if char.islower() else c)
+                idx += 1
+                while idx < n and inserted[idx]:
+                    result.append(output_stream[idx])
+                    idx += 1
+        else:
+            result.append(char)
+    return ''.join(result), idx
+
+# --- XỬ LÝ DẠNG LUỒNG (FILE LỚN) ---
+
+class _CharFilter(dict):
+    """Bảng dịch cho str.translate: chuẩn hóa ký tự hợp lệ, xóa các ký tự còn lại"""
+    def __init__(self, size):
+        super().__init__()
+        self.size = size
+
+    def __missing__(self, code):
+        char = chr(code)
+        if self.size == 5:
+            value = char.upper().replace('J', 'I') if is_ascii_letter(char) else None
+        else:
+            value = char.upper() if is_ascii_alnum(char) else None
+        self[code] = value
+        return value
+
+_CHAR_FILTERS = {5: _CharFilter(5), 6: _CharFilter(6)}
+
+# Vị trí k mà text[k] == text[k + 1] (tìm chồng lấn)
+_DOUBLE_RE = re.compile(r'(?=(.)\1)', re.S)
+
+def normalize_text(text, size='5'):
+    """Lọc và chuẩn hóa văn bản giống bước đầu của process_plaintext_5x5/6x6"""
+    return text.translate(_CHAR_FILTERS[int(size)])
+
+def _pair_text(text, sep1='X', sep2='Y', final=True):
+    """
+    Tách cặp văn bản đã chuẩn hóa. Chỉ những vị trí trùng nằm ở đầu cặp mới
+    làm lệch căn cặp, nên phần còn lại được cắt nguyên khối thay vì duyệt từng ký tự.
+    Returns: (chuỗi cặp liền nhau, vị trí đã chèn separator, ký tự lẻ còn chờ)
+    """
+    parts = []
+    inserted = []
+    length = 0
+    start = 0
+    for m in _DOUBLE_RE.finditer(text):
+        k = m.start()
+        if k >= start and (k - start) % 2 == 0:
+            a = text[k]
+            parts.append(text[start:k + 1])
+            parts.append(sep2 if a == sep1 else sep1)
+            length += k + 1 - start
+            inserted.append(length)
+            length += 1
+            start = k + 1
+
+    pending = ''
+    if (len(text) - start) % 2:
+        if final:
+            a = text[-1]
+            parts.append(text[start:])
+            parts.append(sep2 if a == sep1 else sep1)
+            inserted.append(length + len(text) - start)
+        else:
+            parts.append(text[start:-1])
+            pending = text[-1]
+    else:
+        parts.append(text[start:])
+    return ''.join(parts), inserted, pending
+
+def iter_pair_stream(chunks, size='5', sep1='X', sep2='Y'):
+    """
+    Tách cặp dạng luồng: nhận iterator các đoạn văn bản thô, sinh ra các đoạn
+    chuỗi cặp (độ dài chẵn). Ký tự lẻ cuối mỗi đoạn được giữ lại để ghép với đoạn sau,
+    nên kết quả nối lại trùng với ''.join(pairs) của process_plaintext_5x5/6x6.
+    """
+    table = _CHAR_FILTERS[int(size)]
+    pending = ''
+    for chunk in chunks:
+        text = pending + chunk.translate(table)
+        stream, _, pending = _pair_text(text, sep1, sep2, final=False)
+        if stream:
+            yield stream
+    if pending:
+        yield pending + (sep2 if pending == sep1 else sep1)
+
+def iter_file_chunks(path, chunk_size=1 << 20, encoding='utf-8'):
+    """Đọc file văn bản theo từng đoạn chunk_size ký tự"""
+    with open(path, 'r', encoding=encoding) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+# --- XỬ LÝ FILE SANG FILE (MMAP) ---
+
+# File được đọc theo byte và giải mã latin-1 (1 byte = 1 ký tự, không tốn chi phí
+# UTF-8). Chỉ byte ASCII mới hợp lệ, kể cả 0xDF ('ß' trong latin-1) cũng bị bỏ qua,
+# nên các ký tự nhiều byte của UTF-8 được ghi lại nguyên vẹn.
+_FILE_VALID = {
+    5: frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'),
+    6: frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'),
+}
+_FILE_FILTERS = {
+    size: {i: (chr(i).upper().replace('J', 'I') if size == 5 else chr(i).upper())
+              if chr(i) in valid else None for i in range(256)}
+    for size, valid in _FILE_VALID.items()
+}
+_FILE_INVALID = {
+    size: ''.join(chr(i) for i in range(256) if chr(i) not in valid)
+    for size, valid in _FILE_VALID.items()
+}
+
+def _process_file(cipher, src_path, dst_path, mode, sep1, sep2, block_size):
+    """
+    Đọc file nguồn qua mmap theo từng khối, ghi vào file đích đã cấp phát trước
+    (tối đa gấp đôi nguồn, cắt lại khi xong). Ký tự lẻ cuối khối được giữ lại tới khối sau;
+    các ký tự không hợp lệ theo sau nó được ghi ngay, sau 2 byte dành sẵn cho kết quả của
+    ký tự lẻ (ký tự mã hóa và có thể thêm separator). Khi ký tự lẻ có cặp thì điền vào chỗ
+    dành sẵn (dời đoạn đã ghi lùi 1 byte nếu không có separator), nên bộ nhớ chỉ phụ thuộc
+    block_size và kết quả trùng với restore_text trên cả file.
+    Returns: số byte đã ghi
+    """
+    if not (sep1.isascii() and sep2.isascii()):
+        raise ValueError("Separator phải là ký tự ASCII khi xử lý file")
+    size = cipher.size
+    table = _FILE_FILTERS[size]
+    invalid = _FILE_INVALID[size]
+    is_valid = _FILE_VALID[size].__contains__
+    translate = cipher.encrypt_stream if mode == 'encrypt' else cipher.decrypt_stream
+
+    with open(src_path, 'rb') as src, open(dst_path, 'w+b') as dst:
+        src_size = os.fstat(src.fileno()).st_size
+        if src_size == 0:
+            return 0
+        dst.truncate(src_size * 2)
+        written = 0
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as src_map, \
+                mmap.mmap(dst.fileno(), src_size * 2) as dst_map:
+            pending = ''
+            pending_char = ''  # ký tự nguồn của pending (giữ hoa/thường)
+            gap = None         # vị trí 2 byte dành cho kết quả của pending
+            for offset in range(0, src_size, block_size):
+                block = src_map[offset:offset + block_size].decode('latin-1')
+                final = offset + block_size >= src_size
+                stream, inserted, new_pending = _pair_text(pending + block.translate(table), sep1, sep2, final=final)
+                source = pending_char + block
+                pending_char = run = ''
+                if new_pending:
+                    # Ký tự hợp lệ cuối cùng (chưa có cặp) và các ký tự không hợp lệ sau nó
+                    cut = len(source.rstrip(invalid)) - 1
+                    source, pending_char, run = source[:cut], source[cut], source[cut + 1:]
+                out = restore_text(source, translate(stream), inserted, size, is_valid=is_valid).encode('latin-1')
+                if gap is not None and stream:
+                    # pending đã có cặp: kết quả của nó là 1 ký tự, thêm separator nếu được chèn ngay sau
+                    head = 2 if inserted and inserted[0] == 1 else 1
+                    dst_map[gap:gap + head] = out[:head]
+                    if head == 1:
+                        dst_map.move(gap + 1, gap + 2, written - gap - 2)
+                        written -= 1
+                    out = out[head:]
+                    gap = None
+                dst_map[written:written + len(out)] = out
+                written += len(out)
+                if new_pending and gap is None:
+                    gap = written
+                    written += 2
+                dst_map[written:written + len(run)] = run.encode('latin-1')
+                written += len(run)
+                pending = new_pending
+            dst_map.flush()
+        dst.truncate(written)
+    return written
+
+# --- MÃ HÓA LẠI TĂNG DẦN KHI SỬA VĂN BẢN ---
+
+class _Block:
+    """Một khối văn bản bắt đầu ở đầu cặp, cùng các kết quả đã tính của nó"""
+    __slots__ = ('source', 'norm', 'stream', 'inserted', 'output', 'result', 'odd_tail', 'carry_in', 'carry')
+
+    def copy(self):
+        block = _Block()
+        for name in self.__slots__:
+            setattr(block, name, getattr(self, name))
+        return block
+
+# Phần output chưa dùng chuyển sang khối sau: (chuỗi, vị trí separator trong chuỗi)
+_NO_CARRY = ('', ())
+
+def _spaced_len(stream):
+    # Độ dài khi hiển thị mỗi cặp kèm một dấu cách phía sau (chuỗi cặp luôn có độ dài chẵn)
+    return len(stream) * 3 // 2
+
+_PAIR_RE = re.compile('..', re.S)
+
+def _spaced(stream):
+    return ' '.join(_PAIR_RE.findall(stream)) + ' ' if stream else ''
+
+def _trim_patch(start, end, replacement, total):
+    """
+    Chuyển bản vá trên chuỗi "mỗi cặp kèm dấu cách" (độ dài total) thành bản vá
+    trên chuỗi hiển thị ' '.join(cặp), tức là bỏ dấu cách cuối cùng.
+    """
+    if end < total:
+        return start, end, replacement
+    shown = max(total - 1, 0)
+    if not replacement:
+        return max(start - 1, 0), shown, ''
+    if start > shown:
+        return shown, shown, ' ' + replacement[:-1]
+    return start, shown, replacement[:-1]
+
+def _common_prefix_len(a, b):
+    """Độ dài tiền tố chung, tìm nhị phân trên các lát cắt (so sánh ở mức C)"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _common_suffix_len(a, b, limit):
+    lo, hi = 0, min(len(a), len(b), limit)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+class IncrementalPlayfair:
+    """
+    Mã hóa/giải mã lại tăng dần cho văn bản đang được sửa. Văn bản được chia thành
+    các khối, mỗi khối bắt đầu ở đầu một cặp của toàn văn bản nên tách cặp độc lập
+    cho cùng kết quả. Khi sửa, chỉ các khối bị chạm được tính lại; nếu căn cặp ở
+    ranh giới bị lệch thì gộp dần với khối bên cạnh cho tới khi căn cặp khớp lại.
+    """
+    def __init__(self, cipher, mode='encrypt', sep1='X', sep2='Y', block_size=4096):
+        self.cipher = cipher
+        self.mode = mode
+        self.sep1 = sep1
+        self.sep2 = sep2
+        self.block_size = block_size
+        self._translate = cipher.encrypt_stream if mode == 'encrypt' else cipher.decrypt_stream
+        self._blocks = [self._make_block('')]
+        self._tail = ''
+        self.last_patches = None
+
+    def _make_block(self, source):
+        block = _Block()
+        block.source = source
+        block.norm = normalize_text(source, self.cipher.size)
+        block.stream, block.inserted, _ = _pair_text(block.norm, self.sep1, self.sep2)
+        block.output = self._translate(block.stream)
+        # Cặp cuối chỉ lấy một ký tự (ký tự lẻ được thêm separator)
+        block.odd_tail = bool(block.inserted) and block.inserted[-1] == len(block.stream) - 1
+        self._restore_block(block, _NO_CARRY)
+        return block
+
+    def _restore_block(self, block, carry):
+        """
+        Khôi phục định dạng của khối, dùng trước phần output còn thừa của các khối trước.
+        Ký tự chuẩn hóa thành nhiều chữ (ß -> SS, ﬁ -> FI) làm output dài hơn số ký tự
+        nguồn hợp lệ; phần thừa được dồn sang khối sau giống như restore_text trên toàn văn bản.
+        """
+        text, flags = carry
+        stream = text + block.output
+        inserted = list(flags) + [i + len(text) for i in block.inserted] if text else block.inserted
+        block.result, idx = _restore(block.source, stream, inserted, self.cipher.size)
+        block.carry_in = carry
+        if idx < len(stream):
+            block.carry = (stream[idx:], tuple(i - idx for i in inserted if i >= idx))
+        else:
+            block.carry = _NO_CARRY
+
+    def _propagate(self):
+        """Tính lại các khối có phần output thừa chuyển vào khác với lần tính trước"""
+        blocks = self._blocks
+        carry = _NO_CARRY
+        for k, block in enumerate(blocks):
+            if block.carry_in != carry:
+                # Khối mới để edit() nhận ra kết quả của khối đã đổi
+                block = blocks[k] = block.copy()
+                self._restore_block(block, carry)
+            carry = block.carry
+        self._tail = carry[0]
+
+    def _split(self, source):
+        size = self.block_size
+        return [self._make_block(source[k:k + size]) for k in range(0, len(source), size)] or [self._make_block('')]
+
+    def _settle(self, lo, end):
+        """
+        Kiểm tra các ranh giới quanh khối mới [lo, end] và gộp khối cho tới khi
+        mọi ranh giới đều là đầu cặp của toàn văn bản.
+        """
+        blocks = self._blocks
+        i = max(lo - 1, 0)
+        while i <= end and i < len(blocks) - 1:
+            left, right = blocks[i], blocks[i + 1]
+            # Ranh giới hợp lệ nếu khối trái kết thúc trọn cặp, hoặc ký tự lẻ cuối
+            # trùng ký tự đầu khối phải (khi đó cả văn bản cũng chèn separator)
+            if left.norm and right.norm and (not left.odd_tail or right.norm[0] == left.norm[-1]):
+                i += 1
+                continue
+            blocks[i:i + 2] = [self._make_block(left.source + right.source)]
+            end = max(end - 1, i)
+            i = max(i - 1, 0)
+
+    def set_text(self, text):
+        self._blocks = self._split(text)
+        self._settle(0, len(self._blocks) - 1)
+        self._propagate()
+        self.last_patches = None
+
+    def edit(self, start, end, new_text):
+        """
+        Thay text[start:end] bằng new_text.
+        Returns: (vị trí đầu, vị trí cuối, chuỗi thay thế) trên kết quả cũ để vá tại chỗ.
+        last_patches còn giữ bản vá tương tự cho 'result', 'plain_stream' và 'output_stream'
+        (hai chuỗi cặp ở dạng hiển thị ' '.join(cặp)).
+        """
+        blocks = self._blocks
+        old_blocks = list(blocks)
+        old_tail = self._tail
+        offset = 0
+        i = j = None
+        off_i = off_j = 0
+        for k, block in enumerate(blocks):
+            block_end = offset + len(block.source)
+            if i is None and (start < block_end or k == len(blocks) - 1):
+                i, off_i = k, offset
+            if i is not None and (max(end, start + 1) <= block_end or k == len(blocks) - 1):
+                j, off_j = k, offset
+                break
+            offset = block_end
+        source = blocks[i].source[:start - off_i] + new_text + blocks[j].source[end - off_j:]
+        new_blocks = self._split(source)
+        blocks[i:j + 1] = new_blocks
+        self._settle(i, i + len(new_blocks) - 1)
+        self._propagate()
+
+        # So khớp theo đối tượng để tìm đoạn khối đã thay đổi
+        head = 0
+        while head < min(len(blocks), len(old_blocks)) and blocks[head] is old_blocks[head]:
+            head += 1
+        tail = 0
+        while (tail < min(len(blocks), len(old_blocks)) - head
+               and blocks[-1 - tail] is old_blocks[-1 - tail]):
+            tail += 1
+        old_mid = old_blocks[head:len(old_blocks) - tail]
+        new_mid = blocks[head:len(blocks) - tail]
+
+        out_start = sum(len(b.result) for b in old_blocks[:head])
+        out_end = out_start + sum(len(b.result) for b in old_mid)
+        replacement = ''.join(b.result for b in new_mid)
+        if not tail:
+            # Phần output thừa ở cuối văn bản chỉ đổi khi khối cuối đổi
+            out_end += len(old_tail)
+            replacement += self._tail
+        self.last_patches = {'result': (out_start, out_end, replacement)}
+        for name, attr in (('plain_stream', 'stream'), ('output_stream', 'output')):
+            total = sum(_spaced_len(getattr(b, attr)) for b in old_blocks)
+            before = sum(_spaced_len(getattr(b, attr)) for b in old_blocks[:head])
+            after = before + sum(_spaced_len(getattr(b, attr)) for b in old_mid)
+            self.last_patches[name] = _trim_patch(
+                before, after, ''.join(_spaced(getattr(b, attr)) for b in new_mid), total)
+        return self.last_patches['result']
+
+    def update(self, text):
+        """Cập nhật theo toàn văn bản mới: chỉ phần khác với văn bản cũ được tính lại"""
+        old = self.text
+        prefix = _common_prefix_len(old, text)
+        suffix = _common_suffix_len(old, text, min(len(old), len(text)) - prefix)
+        return self.edit(prefix, len(old) - suffix, text[prefix:len(text) - suffix])
+
+    @property
+    def text(self):
+        return ''.join(b.source for b in self._blocks)
+
+    @property
+    def plain_stream(self):
+        """Chuỗi cặp liền nhau, trùng ''.join(pairs) của process_plaintext_5x5/6x6"""
+        return ''.join(b.stream for b in self._blocks)
+
+    @property
+    def output_stream(self):
+        return ''.join(b.output for b in self._blocks)
+
+    @property
+    def result(self):
+        return ''.join(b.result for b in self._blocks) + self._tail
+
+# --- XỬ LÝ SONG SONG (NHIỀU TIẾN TRÌNH) ---
+
+def pair_split_points(text, chunk_size):
+    """
+    Tìm các điểm cắt văn bản đã chuẩn hóa sao cho mỗi điểm là đầu một cặp,
+    cách nhau khoảng chunk_size ký tự. Chỉ cần quét các vị trí trùng như _pair_text,
+    nên bước tuần tự này rẻ hơn nhiều so với tách cặp thật.
+    """
+    points = [0]
+    target = chunk_size
+    start = 0
+    for m in _DOUBLE_RE.finditer(text):
+        k = m.start()
+        if k >= start and (k - start) % 2 == 0:
+            # Các đầu cặp trong [start, k] là start, start + 2, ...
+            while target <= k:
+                points.append(target + (target - start) % 2)
+                target = points[-1] + chunk_size
+            start = k + 1
+    while target < len(text):
+        points.append(target + (target - start) % 2)
+        target = points[-1] + chunk_size
+    if points[-1] >= len(text) and len(points) > 1:
+        points.pop()
+    return points
+
+_worker_cipher = None
+
+def _init_worker(matrix):
+    global _worker_cipher
+    _worker_cipher = PlayfairCipher(matrix)
+
+def _process_segment(args):
+    # Đoạn bắt đầu ở đầu cặp nên tách cặp độc lập cho kết quả như tách cả văn bản;
+    # ký tự lẻ cuối đoạn cũng được thêm separator giống như khi nó trùng ký tự sau.
+    segment, mode, sep1, sep2 = args
+    stream, _, _ = _pair_text(segment, sep1, sep2)
+    if mode == 'encrypt':
+        return _worker_cipher.encrypt_stream(stream)
+    return _worker_cipher.decrypt_stream(stream)
+
+def _run_parallel(cipher, text, mode, sep1, sep2, workers, chunk_size):
+    text = normalize_text(text, cipher.size)
+    points = pair_split_points(text, chunk_size) + [len(text)]
+    tasks = [(text[points[i]:points[i + 1]], mode, sep1, sep2) for i in range(len(points) - 1)]
+    if len(tasks) <= 1:
+        stream, _, _ = _pair_text(text, sep1, sep2)
+        return cipher.encrypt_stream(stream) if mode == 'encrypt' else cipher.decrypt_stream(stream)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cipher.matrix,)) as pool:
+        return ''.join(pool.map(_process_segment, tasks))
+
+# --- BỘ NHỚ ĐỆM CIPHER THEO KHÓA (LRU) ---
+
+def normalize_key(key, size='5'):
+    """Chuẩn hóa khóa về phần đầu của ma trận: ký tự hợp lệ, viết hoa, bỏ trùng"""
+    return ''.join(dict.fromkeys(normalize_text(key, size)))
+
+class CipherCache:
+    """
+    Bộ nhớ đệm LRU (an toàn đa luồng) các PlayfairCipher đã dựng sẵn, theo khóa
+    chuẩn hóa và kích thước ma trận. Các khóa khác nhau nhưng cho cùng ma trận
+    (khác hoa/thường, ký tự trùng, J/I...) dùng chung một mục.
+    """
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("maxsize phải lớn hơn 0")
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, size='5'):
+        """Trả về cipher cho khóa, dựng mới nếu chưa có trong bộ nhớ đệm"""
+        size = int(size)
+        cache_key = (normalize_key(key, size), size)
+        with self._lock:
+            cipher = self._items.get(cache_key)
+            if cipher is not None:
+                self._items.move_to_end(cache_key)
+                self.hits += 1
+                return cipher
+            self.misses += 1
+
+        # Dựng ngoài khóa để các luồng khác không phải chờ
+        cipher = PlayfairCipher.from_key(cache_key[0], size)
+        with self._lock:
+            if cache_key in self._items:
+                self._items.move_to_end(cache_key)
+                return self._items[cache_key]
+            self._items[cache_key] = cipher
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+        return cipher
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Số liệu để chọn kích thước: hits, misses, evictions, size, maxsize"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._items),
+                'maxsize': self.maxsize,
+            }
+
+_cipher_cache = CipherCache()
+
+def get_cipher(key, size='5'):
+    """Lấy cipher từ bộ nhớ đệm dùng chung của module"""
+    return _cipher_cache.get(key, size)
+
+def cipher_cache_stats():
+    return _cipher_cache.stats()
@@ -0,0 +1,248 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import playfair
+
+try:
+    import numpy as np
+except ImportError:  # Chức năng tìm khóa bắt buộc có NumPy
+    np = None
+
+ALPHABET_5X5 = 'ABCDEFGHIKLMNOPQRSTUVWXYZ'
+ALPHABET_6X6 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+def _alphabet(size):
+    return ALPHABET_5X5 if int(size) == 5 else ALPHABET_6X6
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Tìm khóa Playfair cần NumPy (pip install numpy)")
+
+def _to_codes(text, size):
+    """Chuẩn hóa văn bản và đổi sang mảng mã 0..N-1 theo bảng chữ cái của ma trận"""
+    alphabet = _alphabet(size)
+    table = bytearray(256)
+    for i, c in enumerate(alphabet):
+        table[ord(c)] = i
+    text = playfair.normalize_text(text, size)
+    return np.frombuffer(text.encode('ascii').translate(table), dtype=np.uint8).astype(np.intp)
+
+# --- CHẤM ĐIỂM BẰNG QUADGRAM ---
+
+class QuadgramScorer:
+    """
+    Bảng log10 xác suất quadgram dạng mảng float32 phẳng N⁴ phần tử
+    (25⁴ ≈ 1.8 MB với 5x5, 36⁴ ≈ 6.7 MB với 6x6).
+    """
+    def __init__(self, table, size='5'):
+        _require_numpy()
+        self.size = int(size)
+        self.n = len(_alphabet(size))
+        if len(table) != self.n ** 4:
+            raise ValueError("Bảng quadgram không khớp kích thước ma trận")
+        self.table = np.asarray(table, dtype=np.float32)
+
+    @classmethod
+    def from_text(cls, text, size='5', floor=0.01):
+        """Dựng bảng từ văn bản mẫu; quadgram chưa gặp nhận xác suất floor/tổng"""
+        _require_numpy()
+        n = len(_alphabet(size))
+        codes = _to_codes(text, size)
+        if len(codes) < 4:
+            raise ValueError("Văn bản mẫu quá ngắn")
+        q = _quad_index(codes, np.arange(len(codes) - 3), n)
+        counts = np.bincount(q, minlength=n ** 4)
+        total = counts.sum()
+        table = np.full(n ** 4, math.log10(floor / total), dtype=np.float32)
+        seen = counts > 0
+        table[seen] = np.log10(counts[seen] / total)
+        return cls(table, size)
+
+    @classmethod
+    def load(cls, path):
+        """Đọc bảng từ file .npy; kích thước ma trận suy ra từ số phần tử"""
+        _require_numpy()
+        table = np.load(path)
+        size = '5' if len(table) == len(ALPHABET_5X5) ** 4 else '6'
+        return cls(table, size)
+
+    def save(self, path):
+        np.save(path, self.table)
+
+    def score(self, text):
+        codes = _to_codes(text, self.size)
+        return float(self.table[_quad_index(codes, np.arange(len(codes) - 3), self.n)].sum())
+
+def _quad_index(codes, starts, n):
+    return ((codes[starts] * n + codes[starts + 1]) * n + codes[starts + 2]) * n + codes[starts + 3]
+
+# --- GIẢI MÃ DẠNG MẢNG ---
+
+def _decrypt_codes(key, pos, a, b, size):
+    """
+    Giải mã vector hóa các cặp mã (a, b) với ma trận key (mã theo ô) và pos (ô theo mã),
+    theo đúng thứ tự quy tắc của decrypt_pair: cùng hàng, cùng cột, hình chữ nhật.
+    """
+    pa, pb = pos[a], pos[b]
+    ra, ca = pa // size, pa % size
+    rb, cb = pb // size, pb % size
+    same_row = ra == rb
+    same_col = ca == cb
+    oa = np.where(same_row, ra * size + (ca - 1) % size,
+                  np.where(same_col, ((ra - 1) % size) * size + ca, ra * size + cb))
+    ob = np.where(same_row, rb * size + (cb - 1) % size,
+                  np.where(same_col, ((rb - 1) % size) * size + cb, rb * size + ca))
+    return key[oa], key[ob]
+
+class _KeySearch:
+    """
+    Trạng thái một lần leo đồi: khóa hiện tại, bản rõ và điểm tương ứng.
+    Đổi chỗ hai ô chỉ giải mã lại các cặp có chứa hai ký tự đó (ở bản mã hoặc
+    bản rõ hiện tại) và chỉ chấm lại các quadgram chạm vào vị trí thay đổi.
+    """
+    def __init__(self, cipher_codes, table, size, key):
+        self.size = size
+        self.n = size * size
+        self.table = table
+        self.a = cipher_codes[0::2]
+        self.b = cipher_codes[1::2]
+        self.length = len(cipher_codes)
+        # Chỉ số các cặp bản mã chứa từng ký tự (không đổi trong suốt quá trình)
+        self.cipher_pairs = [np.flatnonzero((self.a == c) | (self.b == c)) for c in range(self.n)]
+        self.decryptions = 0
+        self.set_key(key)
+
+    def set_key(self, key):
+        self.key = np.array(key, dtype=np.intp)
+        self.pos = np.empty(self.n, dtype=np.intp)
+        self.pos[self.key] = np.arange(self.n)
+        self.plain = np.empty(self.length, dtype=np.intp)
+        self.plain[0::2], self.plain[1::2] = _decrypt_codes(self.key, self.pos, self.a, self.b, self.size)
+        self.score = float(self.table[_quad_index(self.plain, np.arange(self.length - 3), self.n)].sum())
+        self.decryptions += 1
+
+    def try_swap(self, i, j):
+        """Đổi chỗ ô i và j; trả về (độ chênh điểm, dữ liệu để hoàn tác)"""
+        key, pos, plain = self.key, self.pos, self.plain
+        x, y = key[i], key[j]
+        hit = np.flatnonzero((plain == x) | (plain == y)) // 2
+        pairs = np.unique(np.concatenate((self.cipher_pairs[x], self.cipher_pairs[y], hit)))
+
+        key[i], key[j] = y, x
+        pos[x], pos[y] = j, i
+        flat = np.concatenate((2 * pairs, 2 * pairs + 1))
+        starts = np.unique((flat[:, None] - np.arange(4)).ravel())
+        starts = starts[(starts >= 0) & (starts <= self.length - 4)]
+
+        old_plain = plain[flat]
+        old_part = self.table[_quad_index(plain, starts, self.n)].sum()
+        plain[2 * pairs], plain[2 * pairs + 1] = _decrypt_codes(key, pos, self.a[pairs], self.b[pairs], self.size)
+        delta = float(self.table[_quad_index(plain, starts, self.n)].sum() - old_part)
+        self.decryptions += 1
+        return delta, (i, j, flat, old_plain)
+
+    def undo_swap(self, undo):
+        i, j, flat, old_plain = undo
+        x, y = self.key[i], self.key[j]
+        self.key[i], self.key[j] = y, x
+        self.pos[x], self.pos[y] = j, i
+        self.plain[flat] = old_plain
+
+def _shuffle_key(key, size, rng):
+    """Các bước thay đổi lớn: đổi hai hàng, đổi hai cột, đảo ngược hoặc chuyển vị ma trận"""
+    grid = [key[r * size:(r + 1) * size] for r in range(size)]
+    move = rng.randrange(4)
+    if move == 0:
+        r1, r2 = rng.sample(range(size), 2)
+        grid[r1], grid[r2] = grid[r2], grid[r1]
+    elif move == 1:
+        c1, c2 = rng.sample(range(size), 2)
+        for row in grid:
+            row[c1], row[c2] = row[c2], row[c1]
+    elif move == 2:
+        grid = [row[::-1] for row in grid[::-1]]
+    else:
+        grid = [list(col) for col in zip(*grid)]
+    return [c for row in grid for c in row]
+
+def _anneal(cipher_codes, table, size, iterations, temperature, seed):
+    """Một lần simulated annealing từ khóa ngẫu nhiên; trả về (điểm, khóa, số lần giải mã)"""
+    rng = random.Random(seed)
+    n = size * size
+    key = list(range(n))
+    rng.shuffle(key)
+    search = _KeySearch(cipher_codes, table, size, key)
+    best_score, best_key = search.score, search.key.copy()
+
+    for it in range(iterations):
+        t = temperature * (1 - it / iterations) + 1e-9
+        if rng.random() < 0.9:
+            i, j = rng.sample(range(n), 2)
+            delta, undo = search.try_swap(i, j)
+            if delta >= 0 or rng.random() < math.exp(delta / t):
+                search.score += delta
+            else:
+                search.undo_swap(undo)
+        else:
+            old_key, old_score = search.key.tolist(), search.score
+            search.set_key(_shuffle_key(old_key, size, rng))
+            delta = search.score - old_score
+            if delta < 0 and rng.random() >= math.exp(delta / t):
+                search.set_key(old_key)
+        if search.score > best_score:
+            best_score, best_key = search.score, search.key.copy()
+
+    return best_score, best_key.tolist(), search.decryptions
+
+# --- CHẠY SONG SONG NHIỀU LẦN KHỞI ĐỘNG LẠI ---
+
+_worker_state = None
+
+def _init_worker(cipher_codes, table, size):
+    global _worker_state
+    _worker_state = (cipher_codes, table, size)
+
+def _run_restart(args):
+    iterations, temperature, seed = args
+    cipher_codes, table, size = _worker_state
+    return _anneal(cipher_codes, table, size, iterations, temperature, seed)
+
+def crack(ciphertext, scorer, restarts=8, iterations=20000, temperature=20.0, workers=None, seed=None):
+    """
+    Tìm khóa Playfair chỉ từ bản mã: chạy restarts lần annealing độc lập trên
+    một process pool (workers=1 chạy ngay trong tiến trình hiện tại).
+    Returns: dict gồm matrix, plaintext, score, decryptions, decryptions_per_second, elapsed
+    """
+    _require_numpy()
+    size = scorer.size
+    cipher_codes = _to_codes(ciphertext, size)
+    if len(cipher_codes) < 4 or len(cipher_codes) % 2:
+        raise ValueError("Bản mã phải có số ký tự chẵn và ít nhất 4 ký tự")
+
+    rng = random.Random(seed)
+    tasks = [(iterations, temperature, rng.getrandbits(64)) for _ in range(restarts)]
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_anneal(cipher_codes, scorer.table, size, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cipher_codes, scorer.table, size)) as pool:
+            results = list(pool.map(_run_restart, tasks))
+    elapsed = time.perf_counter() - start
+
+    score, key, _ = max(results, key=lambda r: r[0])
+    alphabet = _alphabet(size)
+    letters = [alphabet[c] for c in key]
+    matrix = [letters[r * size:(r + 1) * size] for r in range(size)]
+    decryptions = sum(r[2] for r in results)
+    plaintext = playfair.PlayfairCipher(matrix).decrypt_stream(playfair.normalize_text(ciphertext, size))
+    return {
+        'matrix': matrix,
+        'plaintext': plaintext,
+        'score': score,
+        'decryptions': decryptions,
+        'decryptions_per_second': decryptions / elapsed if elapsed else 0.0,
+        'elapsed': elapsed,
+    }
@@ -0,0 +1,168 @@
+import math
+
+import entropy
+
+# --- BẢNG SỐ NGUYÊN TỐ NHỎ ---
+
+def _odd_primes_below(limit):
+    """Sàng Eratosthenes: các số nguyên tố lẻ nhỏ hơn limit"""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(3, limit, 2) if sieve[i]]
+
+# 3511 số nguyên tố lẻ đầu tiên (< 2^15) dùng để sàng ứng viên và chia thử
+SMALL_PRIMES = _odd_primes_below(1 << 15)
+_SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+# Tích các số nguyên tố nhỏ: một phép gcd thay cho 3511 phép chia thử
+_SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES)
+
+# Với n < 3317044064679887385961981 (~3.3e24), Miller-Rabin với 13 cơ sở đầu là tất định
+_DETERMINISTIC_LIMIT = 3317044064679887385961981
+_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+def miller_rabin_rounds(bits):
+    """
+    Số vòng Miller-Rabin cho ứng viên NGẪU NHIÊN có số bit cho trước.
+    Từ 512 bit theo FIPS 186-4 bảng C.3 (sai số <= 2^-100); nhỏ hơn theo ước lượng
+    Damgård-Landrock-Pomerance. Không dùng cho số do người khác cung cấp (dùng is_prime).
+    """
+    if bits >= 1536: return 4
+    if bits >= 476: return 5
+    if bits >= 400: return 6
+    if bits >= 347: return 7
+    if bits >= 308: return 8
+    if bits >= 55: return 27
+    return 34
+
+# --- CÁC PHÉP KIỂM TRA ---
+
+def trial_division(n):
+    """Trả về True/False nếu quyết định được bằng số nguyên tố nhỏ, None nếu chưa rõ"""
+    if n < 2: return False
+    if n == 2 or n in _SMALL_PRIME_SET: return True
+    if n % 2 == 0: return False
+    if math.gcd(n, _SMALL_PRIMES_PRODUCT) != 1: return False
+    if n < (1 << 30):  # nhỏ hơn bình phương của số nguyên tố đầu tiên ngoài bảng
+        return True
+    return None
+
+def miller_rabin(n, bases):
+    """Miller-Rabin mạnh với các cơ sở cho trước (n lẻ, n > 3)"""
+    r, d = 0, n - 1
+    while d % 2 == 0:
+        r += 1
+        d //= 2
+
+    for a in bases:
+        a %= n
+        if a in (0, 1, n - 1):
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def jacobi(a, n):
+    """Ký hiệu Jacobi (a/n), n lẻ dương"""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def strong_lucas(n):
+    """Kiểm tra Lucas mạnh với tham số Selfridge (phương pháp A), n lẻ và không nhỏ"""
+    if math.isqrt(n) ** 2 == n:
+        return False
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1: break
+        if j == 0 and abs(D) != n: return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # Tính U_d, V_d, Q^d mod n theo nhị phân từ trái sang phải
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = P * U + V, D * U + P * V
+            U = (U + n if U % 2 else U) // 2 % n
+            V = (V + n if V % 2 else V) // 2 % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+def baillie_psw(n):
+    """Baillie-PSW: Miller-Rabin cơ sở 2 + Lucas mạnh (chưa biết phản ví dụ)"""
+    decided = trial_division(n)
+    if decided is not None:
+        return decided
+    return miller_rabin(n, (2,)) and strong_lucas(n)
+
+# --- GIAO DIỆN CHÍNH ---
+
+def is_prime(n):
+    """
+    Kiểm tra nguyên tố cho số bất kỳ (kể cả khóa nhập từ ngoài): chia thử, tất định
+    với n < 3.3e24, lớn hơn thì dùng Baillie-PSW.
+    """
+    decided = trial_division(n)
+    if decided is not None:
+        return decided
+    if n < _DETERMINISTIC_LIMIT:
+        return miller_rabin(n, _DETERMINISTIC_BASES)
+    return miller_rabin(n, (2,)) and strong_lucas(n)
+
+def is_probable_prime(n, rounds=None, trial=True):
+    """
+    Kiểm tra ứng viên ngẫu nhiên khi sinh khóa: số vòng Miller-Rabin theo
+    miller_rabin_rounds nếu không chỉ định (hoặc Baillie-PSW khi rẻ hơn).
+    trial=False khi ứng viên đã được sàng bằng SMALL_PRIMES.
+    """
+    if trial or n < (1 << 30):
+        decided = trial_division(n)
+        if decided is not None:
+            return decided
+    if n < _DETERMINISTIC_LIMIT:
+        return miller_rabin(n, _DETERMINISTIC_BASES)
+    if rounds is None:
+        rounds = miller_rabin_rounds(n.bit_length())
+        # Lucas mạnh tốn khoảng 3 vòng Miller-Rabin: khi bảng đòi nhiều hơn 4 vòng
+        # (dưới 1536 bit) thì Baillie-PSW vừa nhanh hơn vừa mạnh hơn
+        if rounds > 4:
+            return miller_rabin(n, (2,)) and strong_lucas(n)
+    # Cơ sở 2 trước (rẻ và loại gần hết hợp số), các vòng còn lại ngẫu nhiên
+    bases = [2] + [entropy.randint(3, n - 2) for _ in range(rounds - 1)]
+    return miller_rabin(n, bases)
@@ -0,0 +1,175 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import entropy
+import rsa
+
+# --- ĐỊNH DẠNG CONTAINER RSA THEO KHỐI (ĐỌC NGẪU NHIÊN ĐƯỢC) ---
+#
+# Header: MAGIC | k (2 byte) | payload mỗi khối = k - 11 (2 byte) | kích thước bản rõ (8 byte)
+#         | số khối (8 byte)
+# Sau header là các khối bản mã RSA thô, mỗi khối đúng k byte (int_to_bytes đệm 0 bên trái).
+# Mọi khối trừ khối cuối chứa đủ k - 11 byte bản rõ, nên chỉ mục khối là phép tính:
+# khối i nằm ở HEADER_SIZE + i * k và chứa bản rõ [i * (k - 11), (i + 1) * (k - 11)).
+
+CONTAINER_MAGIC = b'RSAC\x01'
+HEADER_SIZE = len(CONTAINER_MAGIC) + 2 + 2 + 8 + 8
+
+# Số khối mỗi tác vụ khi chạy song song
+BATCH_BLOCKS = 256
+
+def _key_bytes(n):
+    return (n.bit_length() + 7) // 8
+
+def _pack_header(k, payload, size, count):
+    return (CONTAINER_MAGIC + k.to_bytes(2, 'big') + payload.to_bytes(2, 'big')
+            + size.to_bytes(8, 'big') + count.to_bytes(8, 'big'))
+
+def _unpack_header(data):
+    if data[:len(CONTAINER_MAGIC)] != CONTAINER_MAGIC or len(data) < HEADER_SIZE:
+        raise ValueError("Not an RSA container")
+    pos = len(CONTAINER_MAGIC)
+    k = int.from_bytes(data[pos:pos + 2], 'big')
+    payload = int.from_bytes(data[pos + 2:pos + 4], 'big')
+    size = int.from_bytes(data[pos + 4:pos + 12], 'big')
+    count = int.from_bytes(data[pos + 12:pos + 20], 'big')
+    return k, payload, size, count
+
+def _check_layout(k, payload, size, count, file_size):
+    """Header phải khớp với chính nó và với độ dài file (phát hiện container bị cắt/hỏng)"""
+    if payload != k - 11 or count != -(-size // payload):
+        raise ValueError("Corrupt RSA container header")
+    if file_size != HEADER_SIZE + count * k:
+        raise ValueError("RSA container is truncated or has trailing data")
+
+def _decrypt_blocks(data, first, count, payload, k, size, key):
+    """
+    Giải mã count khối liên tiếp bắt đầu từ khối first. Mỗi khối phải cho đúng payload byte
+    (khối cuối: phần còn lại của size); sai độ dài nghĩa là container bị hỏng.
+    """
+    if len(data) != count * k:
+        raise ValueError("RSA container is truncated")
+    out = []
+    for i in range(count):
+        block = rsa.decrypt_bytes(data[i * k:(i + 1) * k], key)
+        if len(block) != min(payload, size - (first + i) * payload):
+            raise ValueError("Corrupt RSA container block")
+        out.append(block)
+    return b''.join(out)
+
+# --- TÁC VỤ CHO TIẾN TRÌNH CON ---
+
+_worker_key = None
+
+def _init_worker(key):
+    global _worker_key
+    _worker_key = key
+
+def _encrypt_batch(src_path, dst_path, first, count, payload, k, key=None, seed=None):
+    """Mã hóa các khối [first, first + count) và ghi thẳng vào vị trí của chúng trong file đích"""
+    key = key or _worker_key
+    entropy.init_worker(seed)
+    with open(src_path, 'rb') as src:
+        src.seek(first * payload)
+        data = src.read(count * payload)
+    out = bytearray()
+    for pos in range(0, len(data), payload):
+        out += rsa.encrypt_bytes(data[pos:pos + payload], key).rjust(k, b'\x00')
+    with open(dst_path, 'r+b') as dst:
+        dst.seek(HEADER_SIZE + first * k)
+        dst.write(out)
+
+def _decrypt_batch(src_path, dst_path, first, count, payload, k, key=None, seed=None):
+    """Giải mã các khối [first, first + count) và ghi vào vị trí bản rõ tương ứng"""
+    key = key or _worker_key
+    with open(src_path, 'rb') as src:
+        size = _unpack_header(src.read(HEADER_SIZE))[2]
+        src.seek(HEADER_SIZE + first * k)
+        data = src.read(count * k)
+    out = _decrypt_blocks(data, first, count, payload, k, size, key)
+    with open(dst_path, 'r+b') as dst:
+        dst.seek(first * payload)
+        dst.write(out)
+
+def _run_batches(func, src_path, dst_path, count, payload, k, key, workers):
+    batches = [(first, min(BATCH_BLOCKS, count - first)) for first in range(0, count, BATCH_BLOCKS)]
+    if workers == 1 or len(batches) <= 1:
+        for first, n in batches:
+            func(src_path, dst_path, first, n, payload, k, key)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(key,)) as pool:
+        futures = [pool.submit(func, src_path, dst_path, first, n, payload, k, None, entropy.worker_seed())
+                   for first, n in batches]
+        for future in futures:
+            future.result()
+
+# --- API ---
+
+def encrypt_file(src_path, dst_path, public_key, workers=None):
+    """
+    Mã hóa file thành container: chia bản rõ thành các khối k - 11 byte, mỗi khối
+    một phép RSA (PKCS#1 v1.5 như rsa.encrypt). Các khối được mã hóa song song.
+    """
+    k = _key_bytes(public_key.n)
+    payload = k - 11
+    size = os.path.getsize(src_path)
+    count = -(-size // payload)
+    with open(dst_path, 'wb') as dst:
+        dst.write(_pack_header(k, payload, size, count))
+        dst.truncate(HEADER_SIZE + count * k)
+    _run_batches(_encrypt_batch, src_path, dst_path, count, payload, k, public_key, workers)
+
+def decrypt_file(src_path, dst_path, private_key, workers=None):
+    """Giải mã toàn bộ container ra file, các khối được giải mã song song"""
+    with open(src_path, 'rb') as src:
+        k, payload, size, count = _unpack_header(src.read(HEADER_SIZE))
+        _check_layout(k, payload, size, count, os.fstat(src.fileno()).st_size)
+    if k != _key_bytes(private_key.n):
+        raise ValueError("Key size does not match container")
+    with open(dst_path, 'wb') as dst:
+        dst.truncate(size)
+    try:
+        _run_batches(_decrypt_batch, src_path, dst_path, count, payload, k, private_key, workers)
+    except ValueError:
+        # Không để lại file bản rõ dở dang (khóa sai hoặc khối hỏng)
+        os.remove(dst_path)
+        raise
+
+class ContainerReader:
+    """Đọc ngẫu nhiên một đoạn bản rõ: chỉ đọc và giải mã các khối chứa đoạn đó"""
+    def __init__(self, path, private_key):
+        self._file = open(path, 'rb')
+        try:
+            self.k, self.payload, self.size, self.count = _unpack_header(self._file.read(HEADER_SIZE))
+            _check_layout(self.k, self.payload, self.size, self.count, os.fstat(self._file.fileno()).st_size)
+            if self.k != _key_bytes(private_key.n):
+                raise ValueError("Key size does not match container")
+        except ValueError:
+            self._file.close()
+            raise
+        self.private_key = private_key
+
+    def read(self, offset, length):
+        """Trả về bản rõ [offset, offset + length), cắt theo kích thước thật"""
+        if offset < 0 or length < 0:
+            raise ValueError("offset và length phải không âm")
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return b''
+        first = offset // self.payload
+        last = (end - 1) // self.payload
+        self._file.seek(HEADER_SIZE + first * self.k)
+        data = self._file.read((last - first + 1) * self.k)
+        plain = _decrypt_blocks(data, first, last - first + 1, self.payload, self.k, self.size,
+                                self.private_key)
+        start = offset - first * self.payload
+        return plain[start:start + end - offset]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+import bigint
+import rsa
+
+BACKENDS = bigint.available_backends()
+needs_gmpy2 = pytest.mark.skipif('gmpy2' not in BACKENDS, reason="gmpy2 chưa được cài")
+
+CARMICHAEL = [561, 1105, 1729, 2465, 2821, 6601, 8911, 41041, 825265, 321197185, 5394826801,
+              232250619601, 9746347772161]
+# Giả nguyên tố mạnh theo nhiều cơ sở nhỏ đầu tiên
+STRONG_PSEUDOPRIMES = [2047, 1373653, 25326001, 3215031751, 2152302898747, 3474749660383,
+                       341550071728321, 3825123056546413051, 318665857834031151167461,
+                       3317044064679887385961981]
+PRIMES = [2, 3, 5, 2**31 - 1, 2**61 - 1, 2**89 - 1, 2**127 - 1]
+COMPOSITES = [0, 1, 4, (2**61 - 1) * (2**89 - 1), 2**128 + 1]
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = bigint.get_backend()
+    yield
+    bigint.set_backend(previous)
+
+def sieve(limit):
+    flags = bytearray([1]) * limit
+    flags[:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return flags
+
+def per_backend(func, *args):
+    results = set()
+    for name in BACKENDS:
+        bigint.set_backend(name)
+        results.add(func(*args))
+    return results
+
+@needs_gmpy2
+def test_powmod_invert_random_operands():
+    rng = random.Random(20)
+    for _ in range(300):
+        bits = rng.randint(2, 2048)
+        mod = rng.getrandbits(bits) | 1 | (1 << (bits - 1))
+        base, exp = rng.getrandbits(bits + 8), rng.getrandbits(bits)
+        assert per_backend(bigint.powmod, base, exp, mod) == {pow(base, exp, mod)}
+        a = rng.randrange(1, mod) if mod > 1 else 1
+        try:
+            expected = pow(a, -1, mod)
+        except ValueError:
+            for name in BACKENDS:
+                bigint.set_backend(name)
+                with pytest.raises(ValueError):
+                    bigint.invert(a, mod)
+        else:
+            assert per_backend(bigint.invert, a, mod) == {expected}
+
+def test_is_prime_next_prime_small():
+    limit = 20000
+    flags = sieve(limit + 100)
+    for name in BACKENDS:
+        bigint.set_backend(name)
+        for n in range(limit):
+            assert bigint.is_prime(n) == bool(flags[n]), (name, n)
+            assert bigint.is_probable_prime(n) == bool(flags[n]), (name, n)
+            nxt = bigint.next_prime(n)
+            assert flags[nxt] and not any(flags[n + 1:nxt]), (name, n)
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_carmichael_and_strong_pseudoprimes(name):
+    bigint.set_backend(name)
+    for n in CARMICHAEL + STRONG_PSEUDOPRIMES + COMPOSITES:
+        assert not bigint.is_prime(n), n
+        assert not bigint.is_probable_prime(n), n
+        if n < DETERMINISTIC_LIMIT:
+            # Dưới ngưỡng này số vòng chỉ định không làm kết quả thành ngẫu nhiên
+            assert not bigint.is_probable_prime(n, rounds=4, trial=False), n
+    for p in PRIMES:
+        assert bigint.is_prime(p) and bigint.is_probable_prime(p)
+        assert bigint.is_probable_prime(p, rounds=4, trial=False)
+
+@needs_gmpy2
+def test_is_probable_prime_agrees_on_random_values():
+    rng = random.Random(2020)
+    for _ in range(200):
+        n = rng.getrandbits(rng.randint(40, 1024)) | 1
+        assert len(per_backend(bigint.is_probable_prime, n)) == 1, n
+        assert per_backend(bigint.is_prime, n) == per_backend(bigint.is_probable_prime, n), n
+    for _ in range(100):
+        n = rng.getrandbits(rng.randint(2, 300))
+        assert len(per_backend(bigint.next_prime, n)) == 1, n
+
+@needs_gmpy2
+@pytest.mark.parametrize('primes', [2, 3])
+def test_keys_cross_backend(primes):
+    message = "Khóa tạo ở backend này giải mã được ở backend kia"
+    for made_with in BACKENDS:
+        bigint.set_backend(made_with)
+        private_key, public_key = rsa.generate_key_pair(1024, workers=1, primes=primes)
+        for used_with in BACKENDS:
+            bigint.set_backend(used_with)
+            assert rsa.decrypt(rsa.encrypt(message, public_key), private_key) == message
+
+def test_set_backend_rejects_unknown():
+    with pytest.raises(ValueError):
+        bigint.set_backend('nope')
+    assert bigint.set_backend('python') == 'python'
+    assert bigint.get_backend() == 'python' and not bigint.is_native()
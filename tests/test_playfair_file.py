@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+import playfair
+
+ALPHABET = b'aabbxXyYzZ0099  ..\n\xdf\xc3\xa9'
+
+def reference(cipher, data, mode, sep1='X', sep2='Y'):
+    text = data.decode('latin-1')
+    stream, inserted, _ = playfair._pair_text(text.translate(playfair._FILE_FILTERS[cipher.size]), sep1, sep2)
+    output = cipher.encrypt_stream(stream) if mode == 'encrypt' else cipher.decrypt_stream(stream)
+    is_valid = playfair._FILE_VALID[cipher.size].__contains__
+    return playfair.restore_text(text, output, inserted, cipher.size, is_valid=is_valid).encode('latin-1')
+
+@pytest.mark.parametrize('size', ['5', '6'])
+@pytest.mark.parametrize('mode', ['encrypt', 'decrypt'])
+def test_matches_whole_file_restore(tmp_path, size, mode):
+    rng = random.Random(f"file{size}{mode}")
+    matrix = playfair.generate_matrix_5x5('playfair') if size == '5' else playfair.generate_matrix_6x6('play2fair')
+    cipher = playfair.PlayfairCipher(matrix)
+    src, dst = tmp_path / 'src', tmp_path / 'dst'
+    for _ in range(40):
+        # Có các đoạn dài toàn ký tự không hợp lệ để ký tự lẻ phải chờ qua nhiều khối
+        parts = [bytes(rng.choice(ALPHABET) for _ in range(rng.randint(0, 30))) for _ in range(4)]
+        parts.insert(rng.randint(0, 4), b'a' + b'.' * rng.randint(0, 40))
+        data = b''.join(parts)
+        src.write_bytes(data)
+        for block_size in (1, 2, 3, 7, 64):
+            process = cipher.encrypt_file if mode == 'encrypt' else cipher.decrypt_file
+            written = process(src, dst, block_size=block_size)
+            assert dst.read_bytes() == reference(cipher, data, mode)
+            assert written == len(dst.read_bytes())
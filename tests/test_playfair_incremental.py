@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+import playfair
+
+# Có ký tự chuẩn hóa thành nhiều chữ (ß -> SS, ligature), chữ thường và ký tự không hợp lệ
+ALPHABET = 'aabbsxyzAXYZ09  .,\nßẞﬁﬂﬀéJj'
+
+def full_result(cipher, text, mode, sep1, sep2):
+    if cipher.size == 5:
+        pairs, inserted = playfair.process_plaintext_5x5(text, sep1=sep1, sep2=sep2)
+    else:
+        pairs, inserted = playfair.process_plaintext_6x6(text, sep1=sep1, sep2=sep2)
+    processed = cipher.encrypt_pairs(pairs) if mode == 'encrypt' else cipher.decrypt_pairs(pairs)
+    return ' '.join(pairs), ' '.join(processed), playfair.restore_text(text, processed.stream, inserted, cipher.size)
+
+def apply(text, patch):
+    start, end, replacement = patch
+    return text[:start] + replacement + text[end:]
+
+def random_text(rng, length):
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+def test_expanding_character_matches_full_path():
+    cipher = playfair.PlayfairCipher(playfair.generate_matrix_5x5('key'))
+    engine = playfair.IncrementalPlayfair(cipher, 'encrypt', block_size=2)
+    engine.set_text("Straße ist gut")
+    assert engine.result == full_result(cipher, "Straße ist gut", 'encrypt', 'X', 'Y')[2]
+
+@pytest.mark.parametrize('size', ['5', '6'])
+@pytest.mark.parametrize('mode', ['encrypt', 'decrypt'])
+def test_random_edits_match_full_path(size, mode):
+    rng = random.Random(f"{size}{mode}")
+    matrix = playfair.generate_matrix_5x5('playfair') if size == '5' else playfair.generate_matrix_6x6('play2fair')
+    cipher = playfair.PlayfairCipher(matrix)
+    for block_size in (1, 2, 3, 5, 16):
+        engine = playfair.IncrementalPlayfair(cipher, mode, 'X', 'Y', block_size)
+        text = random_text(rng, 40)
+        engine.set_text(text)
+        shown = full_result(cipher, text, mode, 'X', 'Y')
+        for _ in range(60):
+            start = rng.randint(0, len(text))
+            end = rng.randint(start, min(len(text), start + 6))
+            text = text[:start] + random_text(rng, rng.randint(0, 6)) + text[end:]
+            engine.update(text)
+            expected = full_result(cipher, text, mode, 'X', 'Y')
+            patches = engine.last_patches
+            shown = (apply(shown[0], patches['plain_stream']),
+                     apply(shown[1], patches['output_stream']),
+                     apply(shown[2], patches['result']))
+            assert shown == expected
+            assert engine.result == expected[2]
+            assert engine.plain_stream == expected[0].replace(' ', '')
@@ -0,0 +1,72 @@
+import os
+import random
+
+import pytest
+
+import rsa
+import rsa_container
+
+@pytest.fixture(scope='module')
+def key_pair():
+    return rsa.generate_key_pair(512)
+
+@pytest.fixture
+def container(key_pair, tmp_path):
+    _, public_key = key_pair
+    src, enc = tmp_path / 'plain', tmp_path / 'enc'
+    src.write_bytes(os.urandom(10000))
+    rsa_container.encrypt_file(src, enc, public_key, workers=1)
+    return src, enc
+
+@pytest.mark.parametrize('size', [0, 1, 53, 54, 55, 107, 108, 5000])
+def test_round_trip(key_pair, tmp_path, size):
+    private_key, public_key = key_pair
+    src, enc, out = tmp_path / 'plain', tmp_path / 'enc', tmp_path / 'out'
+    src.write_bytes(os.urandom(size))
+    rsa_container.encrypt_file(src, enc, public_key, workers=1)
+    rsa_container.decrypt_file(enc, out, private_key, workers=1)
+    assert out.read_bytes() == src.read_bytes()
+
+def test_random_reads(key_pair, container):
+    private_key, _ = key_pair
+    src, enc = container
+    plain = src.read_bytes()
+    rng = random.Random(17)
+    with rsa_container.ContainerReader(enc, private_key) as reader:
+        for _ in range(50):
+            offset, length = rng.randint(0, 10100), rng.randint(0, 600)
+            assert reader.read(offset, length) == plain[offset:offset + length]
+
+def test_parallel_decrypt(key_pair, container, tmp_path):
+    private_key, _ = key_pair
+    src, enc = container
+    out = tmp_path / 'out'
+    rsa_container.decrypt_file(enc, out, private_key, workers=2)
+    assert out.read_bytes() == src.read_bytes()
+
+@pytest.mark.parametrize('cut', [1, 64, 640])
+def test_truncated_container(key_pair, container, tmp_path, cut):
+    private_key, _ = key_pair
+    _, enc = container
+    data = enc.read_bytes()
+    enc.write_bytes(data[:-cut])
+    out = tmp_path / 'out'
+    with pytest.raises(ValueError):
+        rsa_container.decrypt_file(enc, out, private_key, workers=1)
+    assert not out.exists()
+    with pytest.raises(ValueError):
+        rsa_container.ContainerReader(enc, private_key)
+
+def test_damaged_block(key_pair, container, tmp_path):
+    private_key, _ = key_pair
+    _, enc = container
+    data = bytearray(enc.read_bytes())
+    # Thay khối cuối bằng bản mã hợp lệ của một khối đầy đủ: giải mã được nhưng sai độ dài
+    k = (private_key.n.bit_length() + 7) // 8
+    data[-k:] = rsa.encrypt_bytes(b'x' * (k - 11), private_key.public_key()).rjust(k, b'\x00')
+    enc.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        rsa_container.decrypt_file(enc, tmp_path / 'out', private_key, workers=1)
+    with rsa_container.ContainerReader(enc, private_key) as reader:
+        with pytest.raises(ValueError):
+            reader.read(9990, 10)
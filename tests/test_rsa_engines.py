@@ -0,0 +1,44 @@
+import pytest
+
+import rsa
+import rsa_container
+
+ERROR = "Error: Decryption Failed or Key Mismatch"
+
+@pytest.fixture(params=rsa.ENGINES)
+def engine(request):
+    previous = rsa.get_engine()
+    rsa.set_engine(request.param)
+    yield request.param
+    rsa.set_engine(previous)
+
+@pytest.fixture(scope='module')
+def keys():
+    # Hai cặp khóa cùng kích thước: bản mã của khóa này giải bằng khóa kia
+    return rsa.generate_key_pair(1024), rsa.generate_key_pair(1024)
+
+def test_round_trip(engine, keys):
+    (private_key, public_key), _ = keys
+    for message in ("", "xin chào", "x" * 117):
+        assert rsa.decrypt(rsa.encrypt(message, public_key), private_key) == message
+    data = b'\x00\x01' * 3000
+    assert rsa.decrypt_envelope_bytes(rsa.encrypt_envelope_bytes(data, public_key), private_key) == data
+
+def test_wrong_key_is_rejected(engine, keys):
+    (_, public_key), (wrong_key, _) = keys
+    for i in range(300):
+        ciphertext = rsa.encrypt_bytes(i.to_bytes(8, 'big'), public_key)
+        with pytest.raises(ValueError):
+            rsa.decrypt_bytes(ciphertext, wrong_key)
+        assert rsa.decrypt(rsa.encrypt(str(i), public_key), wrong_key) == ERROR
+    for _ in range(20):
+        with pytest.raises(ValueError):
+            rsa.decrypt_envelope_bytes(rsa.encrypt_envelope_bytes(b'secret', public_key), wrong_key)
+
+def test_container_wrong_key(engine, keys, tmp_path):
+    (_, public_key), (wrong_key, _) = keys
+    src, enc, out = tmp_path / 'plain', tmp_path / 'enc', tmp_path / 'out'
+    src.write_bytes(bytes(range(256)) * 20)
+    rsa_container.encrypt_file(src, enc, public_key, workers=1)
+    with pytest.raises(ValueError):
+        rsa_container.decrypt_file(enc, out, wrong_key, workers=1)
@@ -0,0 +1,33 @@
+import pytest
+
+import rsa
+
+@pytest.fixture(scope='module')
+def key_pair():
+    return rsa.generate_key_pair(512)
+
+def pem_variants(pem):
+    data = pem.encode('utf-8')
+    crlf = pem.replace('\n', '\r\n').encode('utf-8')
+    return [data, b'\xef\xbb\xbf' + data, b'\n\n' + data, b'  ' + data, crlf,
+            b'\xef\xbb\xbf\r\n' + crlf, bytearray(b' ' + data), '﻿' + pem]
+
+def test_pem_with_bom_and_leading_whitespace(key_pair):
+    private_key, public_key = key_pair
+    for data in pem_variants(rsa.serialize_public_key(public_key)):
+        assert rsa.load_public_key(data).n == public_key.n
+    for data in pem_variants(rsa.serialize_private_key(private_key)):
+        assert rsa.load_private_key(data).d == private_key.d
+
+@pytest.mark.parametrize('der', [False, True])
+def test_binary_round_trip(key_pair, der):
+    private_key, public_key = key_pair
+    public_data = rsa.serialize_public_key_binary(public_key, der=der)
+    private_data = rsa.serialize_private_key_binary(private_key, der=der)
+    for wrap in (bytes, bytearray, memoryview):
+        assert rsa.load_public_key(wrap(public_data)).n == public_key.n
+        assert rsa.load_private_key(wrap(private_data)).d == private_key.d
+
+def test_invalid_data_raises_value_error():
+    with pytest.raises(ValueError):
+        rsa.load_public_key(b'not a key')